@@ -1,18 +1,18 @@
 import os
-import urllib.request
 
 import matplotlib.pyplot as plt
-from PIL import Image
 from tqdm import tqdm
 
 from utils.commons import (
     fetchMatch,
     getTeamMatchesFromSeason,
     getTeamsBySeason,
+    prefetchSeason,
     saveFigure,
 )
 from utils.config import *
 from utils.fullPitch import FullPitch
+from utils.logos import LogoCache
 
 COMPETITION_ID = 2
 SEASON_ID = 27
@@ -35,6 +35,7 @@ fig, axes = plt.subplots(N_ROWS, N_COLS, figsize=(fig_width, fig_height))
 axes = axes.flatten()
 fig.patch.set_facecolor(FIG_BACKGROUND_COLOR)
 
+prefetchSeason(COMPETITION_ID, SEASON_ID)
 teams = sorted(getTeamsBySeason(competitionId=COMPETITION_ID, seasonId=SEASON_ID))
 for idx, team in enumerate(tqdm(teams, leave=False)):
     games = getTeamMatchesFromSeason(COMPETITION_ID, SEASON_ID, team)
@@ -43,16 +44,19 @@ for idx, team in enumerate(tqdm(teams, leave=False)):
         df = match.events
 
 
+logos = LogoCache()
+logos.prefetch(teams)
 for idx, team in enumerate(teams):
     pitch = FullPitch()
     pitch.draw(ax=axes[idx])
     axes[idx].set_facecolor(FIG_BACKGROUND_COLOR)
-    img = Image.open(urllib.request.urlopen(TEAM_LOGO_URL[team])).convert("LA")
-    image_ax = axes[idx].inset_axes(
-        [0.02, 0.98, 0.10, 0.10], transform=axes[idx].transAxes
-    )
-    image_ax.imshow(img)
-    image_ax.axis("off")
+    img = logos.get(team, "LA")
+    if img is not None:
+        image_ax = axes[idx].inset_axes(
+            [0.02, 0.98, 0.10, 0.10], transform=axes[idx].transAxes
+        )
+        image_ax.imshow(img)
+        image_ax.axis("off")
     axes[idx].text(13, 87, team, fontsize=10, va="center")
 
 
@@ -1,18 +1,15 @@
 import matplotlib.pyplot as plt
 import os
 import numpy as np
-import urllib.request
 import pandas as pd
 
-from PIL import Image, ImageEnhance
-from tqdm import tqdm
 from utils.commons import (
-    getTeamMatchesFromSeason,
-    getTeamsBySeason,
-    fetchMatch,
+    prefetchSeason,
     saveFigure,
 )
+from utils.season import aggregateSeasonByTeam
 from utils.config import *
+from utils.logos import LogoCache
 
 folder = os.path.join("imgs/", str(f"goalkeepers/passCompletion"))
 os.makedirs(folder, exist_ok=True)
@@ -22,36 +19,44 @@ COMPETITION_ID = 2
 SEASON_ID = 27
 LOGO_W = 0.025
 LOGO_H = 0.025
+# Length above which a goalkeeper pass counts as long, for high / other passes
+LONG_HIGH_PASS = 25
+LONG_PASS = 45
+# Bump when gkPassCounts changes, so its cached partials are recomputed
+GK_PASS_COUNTS_VERSION = 1
 
 # Data
-teams = sorted(getTeamsBySeason(COMPETITION_ID, SEASON_ID))
-records = []
-for team in tqdm(teams, leave=False):
-    games = getTeamMatchesFromSeason(COMPETITION_ID, SEASON_ID, team)
-    long_attempted = short_attempted = long_completed = short_completed = 0
-
-    for gameId in tqdm(games, leave=False):
-        match = fetchMatch(gameId, load_360=True)
-        df = match.events
-
-        gkPasses = df[
-            (df["type_name"] == "Pass")
-            & (df["team_name"] == team)
-            & (df["position_name"] == "Goalkeeper")
+def gkPassCounts(gkPasses):
+    isHigh = gkPasses["pass_height"] == "High Pass"
+    thresholds = np.where(isHigh, LONG_HIGH_PASS, LONG_PASS)
+    is_long = gkPasses["pass_length"].to_numpy() > thresholds
+    successful = gkPasses["pass_success"].to_numpy()
+    return np.array(
+        [
+            is_long.sum(),
+            (~is_long).sum(),
+            (is_long & successful).sum(),
+            (~is_long & successful).sum(),
         ]
+    )
 
-        heights = gkPasses["extra"].apply(lambda x: x["pass"]["height"]["name"])
-        lengths = gkPasses["extra"].apply(lambda x: x["pass"]["length"])
-        successful = gkPasses["extra"].apply(lambda x: "outcome" not in x["pass"])
-
-        thresholds = np.where(heights == "High Pass", 25, 45)
-        is_long = lengths.values > thresholds
-
-        long_attempted += is_long.sum()
-        short_attempted += (~is_long).sum()
-        long_completed += (is_long & successful.values).sum()
-        short_completed += (~is_long & successful.values).sum()
 
+prefetchSeason(COMPETITION_ID, SEASON_ID)
+passCountsMap = aggregateSeasonByTeam(
+    COMPETITION_ID,
+    SEASON_ID,
+    gkPassCounts,
+    columns=["pass_height", "pass_length", "pass_success"],
+    filters=[
+        ("type_name", "==", "Pass"),
+        ("position_name", "==", "Goalkeeper"),
+    ],
+    cacheName="gkPassCompletion",
+    cacheParams=(GK_PASS_COUNTS_VERSION, LONG_HIGH_PASS, LONG_PASS),
+)
+records = []
+for team, counts in sorted(passCountsMap.items()):
+    long_attempted, short_attempted, long_completed, short_completed = counts
     records.append(
         {
             "team": team,
@@ -88,14 +93,16 @@ ax.set_ylim(minY - padY, maxY + padY)
 ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x:.0%}"))
 ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f"{y:.0%}"))
 
+logos = LogoCache()
+logos.prefetch(pdf["team"])
 for _, row in pdf.iterrows():
     team = row["team"]
     x = row["shareOfLong"]
     y = row["passCompletionRate"]
 
-    img = Image.open(urllib.request.urlopen(TEAM_LOGO_URL[team])).convert("RGBA")
-    enhancer = ImageEnhance.Color(img)
-    img = enhancer.enhance(0.5)  # Lowers saturation
+    img = logos.get(team, "desaturated")
+    if img is None:
+        continue
     img_x = x - LOGO_W / 2
     img_y = y - LOGO_H / 2
     image_ax = ax.inset_axes([img_x, img_y, LOGO_W, LOGO_H], transform=ax.transData)
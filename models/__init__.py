@@ -1 +1,3 @@
 from .match import Match
+from .eventTable import EventTable
+from .frames360 import Frames360
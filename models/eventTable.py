@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Nested event columns that are not part of the table
+NESTED_COLS = [
+    "extra",
+    "location",
+    "related_events",
+    "visible_area_360",
+    "freeze_frame_360",
+]
+
+# Typed columns extracted from the extra dict: (column, path, dtype)
+EXTRA_FIELDS = [
+    ("pass_end_x", ("pass", "end_location", 0), "float64"),
+    ("pass_end_y", ("pass", "end_location", 1), "float64"),
+    ("pass_length", ("pass", "length"), "float64"),
+    ("pass_angle", ("pass", "angle"), "float64"),
+    ("pass_height", ("pass", "height", "name"), "string"),
+    ("pass_outcome", ("pass", "outcome", "name"), "string"),
+    ("pass_recipient_id", ("pass", "recipient", "id"), "float64"),
+    ("pass_recipient_name", ("pass", "recipient", "name"), "string"),
+    ("shot_xg", ("shot", "statsbomb_xg"), "float64"),
+    ("shot_end_x", ("shot", "end_location", 0), "float64"),
+    ("shot_end_y", ("shot", "end_location", 1), "float64"),
+    ("shot_end_z", ("shot", "end_location", 2), "float64"),
+    ("shot_outcome", ("shot", "outcome", "name"), "string"),
+    ("shot_technique", ("shot", "technique", "name"), "string"),
+    ("shot_body_part", ("shot", "body_part", "name"), "string"),
+    ("shot_type", ("shot", "type", "name"), "string"),
+    ("carry_end_x", ("carry", "end_location", 0), "float64"),
+    ("carry_end_y", ("carry", "end_location", 1), "float64"),
+]
+
+
+def _dig(d, path):
+    """Follow a path of dict keys / list indices, returning None when missing."""
+    for key in path:
+        if isinstance(d, dict):
+            d = d.get(key)
+        elif isinstance(d, list) and isinstance(key, int) and key < len(d):
+            d = d[key]
+        else:
+            return None
+    return d
+
+
+class EventTable:
+    """
+    Typed, columnar view of a match's events.
+
+    The pass, shot and carry fields that live in the nested extra dict are
+    exposed as flat columns (e.g. pass_end_x, pass_success, shot_xg), so
+    filters become vectorized column operations instead of dict traversal.
+    Coordinates are in raw StatsBomb orientation.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    @classmethod
+    def fromEvents(cls, events):
+        """Builds the table from a Loader.events frame, in one pass per field."""
+        frame = events.drop(columns=[c for c in NESTED_COLS if c in events])
+        locations = events["location"].to_numpy()
+        frame["location_x"] = np.array(
+            [loc[0] if isinstance(loc, list) else np.nan for loc in locations]
+        )
+        frame["location_y"] = np.array(
+            [loc[1] if isinstance(loc, list) else np.nan for loc in locations]
+        )
+
+        extras = events["extra"].to_numpy()
+        for col, path, dtype in EXTRA_FIELDS:
+            frame[col] = pd.Series(
+                [_dig(e, path) for e in extras], index=events.index, dtype=dtype
+            )
+        # A StatsBomb pass is successful if it has no outcome
+        frame["pass_success"] = (frame["type_name"] == "Pass") & frame[
+            "pass_outcome"
+        ].isna()
+
+        return cls(frame)
+
+    def passes(self):
+        return self.frame[self.frame["type_name"] == "Pass"]
+
+    def shots(self):
+        return self.frame[self.frame["type_name"] == "Shot"]
+
+    def carries(self):
+        return self.frame[self.frame["type_name"] == "Carry"]
@@ -0,0 +1,105 @@
+import numpy as np
+
+ARRAYS = [
+    "event_ids",
+    "player_offsets",
+    "player_xy",
+    "teammate",
+    "actor",
+    "keeper",
+    "area_offsets",
+    "area_xy",
+]
+
+
+class Frames360:
+    """
+    Compact, array-backed StatsBomb 360 data of a match.
+
+    The freeze frames of all events are packed into flat arrays: the players
+    of the i-th event are rows player_offsets[i]:player_offsets[i + 1] of
+    player_xy / teammate / actor / keeper, and its visible area polygon is
+    rows area_offsets[i]:area_offsets[i + 1] of the area_xy vertex buffer.
+    Coordinates are in raw StatsBomb orientation.
+    """
+
+    def __init__(
+        self,
+        event_ids,
+        player_offsets,
+        player_xy,
+        teammate,
+        actor,
+        keeper,
+        area_offsets,
+        area_xy,
+    ):
+        self.event_ids = event_ids
+        self.player_offsets = player_offsets
+        self.player_xy = player_xy
+        self.teammate = teammate
+        self.actor = actor
+        self.keeper = keeper
+        self.area_offsets = area_offsets
+        self.area_xy = area_xy
+        self._rows = None
+
+    @classmethod
+    def fromFrames(cls, frames):
+        """Packs the raw frames payload returned by statsbombpy."""
+        players = [p for f in frames for p in f["freeze_frame"]]
+        areas = [
+            np.asarray(f.get("visible_area") or [], dtype=float).reshape(-1, 2)
+            for f in frames
+        ]
+        return cls(
+            event_ids=np.array([f["event_uuid"] for f in frames], dtype=str),
+            player_offsets=np.cumsum([0] + [len(f["freeze_frame"]) for f in frames]),
+            player_xy=np.array(
+                [p["location"][:2] for p in players], dtype=float
+            ).reshape(-1, 2),
+            teammate=np.array([p["teammate"] for p in players], dtype=bool),
+            actor=np.array([p["actor"] for p in players], dtype=bool),
+            keeper=np.array([p["keeper"] for p in players], dtype=bool),
+            area_offsets=np.cumsum([0] + [len(a) for a in areas]),
+            area_xy=np.concatenate(areas) if areas else np.empty((0, 2)),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in ARRAYS})
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            np.savez(f, **{name: getattr(self, name) for name in ARRAYS})
+
+    def __len__(self):
+        return len(self.event_ids)
+
+    def __contains__(self, event_id):
+        return event_id in self._index()
+
+    def _index(self):
+        if self._rows is None:
+            self._rows = {eventId: i for i, eventId in enumerate(self.event_ids)}
+        return self._rows
+
+    def players(self, event_id):
+        """
+        Returns (xy, teammate, actor, keeper) arrays of the players visible in
+        the freeze frame of an event.
+        """
+        i = self._index()[event_id]
+        rows = slice(self.player_offsets[i], self.player_offsets[i + 1])
+        return (
+            self.player_xy[rows],
+            self.teammate[rows],
+            self.actor[rows],
+            self.keeper[rows],
+        )
+
+    def visibleArea(self, event_id):
+        """Returns the (n_vertices, 2) visible area polygon of an event."""
+        i = self._index()[event_id]
+        return self.area_xy[self.area_offsets[i] : self.area_offsets[i + 1]]
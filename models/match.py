@@ -1,8 +1,21 @@
+from .eventTable import EventTable
+
+
 class Match:
-    def __init__(self, gameId, matchEvents, matchTeams, matchPlayers):
+    """
+    A match whose header (ids and team names) is always in memory, while the
+    events, players, typed event table and 360 frames are read from the match
+    store only on first access. Use readEvents to read a projection of the
+    event table without loading the rest, and release to drop what was loaded.
+    """
+
+    def __init__(self, gameId, matchTeams, store):
         self.gameId = gameId
-        self.events = matchEvents
-        self.players = matchPlayers
+        self._store = store
+        self._events = None
+        self._players = None
+        self._table = None
+        self._frames360 = None
 
         self.homeTeamName = matchTeams.iloc[0]["team_name"]
         self.homeTeamId = matchTeams.iloc[0]["team_id"]
@@ -11,3 +24,43 @@ class Match:
 
         self.teamNames = list([self.homeTeamName, self.awayTeamName])
         self.teamIdentifiers = list([self.homeTeamId, self.awayTeamId])
+
+    @property
+    def events(self):
+        """Events frame in the shape of Loader.events, without the 360 columns."""
+        if self._events is None:
+            self._events = self._store.read_full_events(self.gameId)
+        return self._events
+
+    @property
+    def players(self):
+        if self._players is None:
+            self._players = self._store.read_players(self.gameId)
+        return self._players
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = EventTable(self._store.read_table(self.gameId))
+        return self._table
+
+    @property
+    def frames360(self):
+        """Packed 360 freeze frames and visible areas (None if not stored)."""
+        if self._frames360 is None:
+            self._frames360 = self._store.read_frames_360(self.gameId)
+        return self._frames360
+
+    def readEvents(self, columns=None, filters=None):
+        """
+        Reads only the given columns and rows of the event table, without
+        loading or caching the whole frame.
+        """
+        return self._store.read_table(self.gameId, columns=columns, filters=filters)
+
+    def release(self):
+        """Drops every loaded frame, keeping only the match header."""
+        self._events = None
+        self._players = None
+        self._table = None
+        self._frames360 = None
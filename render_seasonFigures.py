@@ -0,0 +1,38 @@
+import os
+
+from utils.commons import getAllMatchesFromSeason, prefetchSeason
+from utils.renderFarm import RenderJob, runRenderJobs
+
+COMPETITION_ID = 55
+SEASON_ID = 43  # EURO 2020
+TEAM_COLORS = ["#3f8ae6", "#f04a5f"]
+WORKERS = os.cpu_count()
+
+if __name__ == "__main__":
+    prefetchSeason(COMPETITION_ID, SEASON_ID)
+
+    jobs = []
+    for gameId in getAllMatchesFromSeason(COMPETITION_ID, SEASON_ID):
+        jobs.append(
+            RenderJob(gameId, "shotFreezeFrames", {"folder": f"imgs/{gameId}"})
+        )
+        for teamIndex, teamColor in enumerate(TEAM_COLORS):
+            jobs.append(
+                RenderJob(
+                    gameId,
+                    "passingNetwork",
+                    {
+                        "folder": "imgs/passingNetwork",
+                        "teamIndex": teamIndex,
+                        "teamColor": teamColor,
+                    },
+                )
+            )
+
+    paths, failed, elapsed = runRenderJobs(jobs, workers=WORKERS)
+    print(
+        f"Rendered {len(paths)} images in {elapsed:.1f} s "
+        f"({len(paths) / elapsed:.2f} images/sec)"
+    )
+    for gameId, error in failed:
+        print(f"Game {gameId} failed: {error!r}")
@@ -0,0 +1,22 @@
+import os
+
+from utils.commons import prefetchSeason
+from utils.renderFarm import runRenderJobs, seasonShotMapJobs
+
+COMPETITION_ID = 55
+SEASON_ID = 43  # EURO 2020
+WORKERS = os.cpu_count()
+
+folder = os.path.join("imgs/", "shotMaps", f"{COMPETITION_ID}_{SEASON_ID}")
+
+if __name__ == "__main__":
+    prefetchSeason(COMPETITION_ID, SEASON_ID)
+
+    jobs = seasonShotMapJobs(COMPETITION_ID, SEASON_ID, folder, chunks=WORKERS * 4)
+    paths, failed, elapsed = runRenderJobs(jobs, workers=WORKERS)
+    print(
+        f"Rendered {len(paths)} shot maps in {elapsed:.1f} s "
+        f"({len(paths) / elapsed:.2f} images/sec)"
+    )
+    for gameId, error in failed:
+        print(f"Shot map job failed: {error!r}")
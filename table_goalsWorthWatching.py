@@ -1,19 +1,43 @@
 import os
 import matplotlib.pyplot as plt
 
-from tqdm import tqdm
-from utils import getAllMatchesFromSeason, fetchMatch
+import heapq
+import numpy as np
+
+from utils import prefetchSeason
+from utils.scoring import xBangerScore
+from utils.season import iterSeasonPartials
 from datetime import datetime
 
 COMPETITION_NAME = "EURO 2020"
-COMPETITION_ID = 55
-SEASON_ID = 43
+# (competition ID, season ID) of every season ranked together
+SEASONS = [(55, 43)]
+TOP_K = 8
+# Bump when goalCandidates or xBangerScore change, to recompute cached partials
+GOAL_CANDIDATES_VERSION = 1
 
 folder = os.path.join("imgs/", str(f"goalsWorthWatching"))
 os.makedirs(folder, exist_ok=True)
 plt.rcParams["font.family"] = "Monospace"
 
-games = getAllMatchesFromSeason(competitionId=COMPETITION_ID, seasonId=SEASON_ID)
+GOAL_COLUMNS = [
+    "team_name",
+    "player_name",
+    "minute",
+    "second",
+    "location_x",
+    "location_y",
+    "shot_xg",
+    "shot_end_x",
+    "shot_end_y",
+    "shot_end_z",
+    "shot_technique",
+    "shot_body_part",
+    "shot_type",
+]
+
+for competitionId, seasonId in SEASONS:
+    prefetchSeason(competitionId, seasonId)
 
 
 class Banger:
@@ -55,49 +79,72 @@ class Banger:
         self.playType = playType
         self.minute = minute
 
-        xBanger = 1 - self.xG
-
-        if self.technique != "Normal":
-            xBanger += 0.1
-
-        distance = ((40 - endLocation[1]) ** 2 + (0 - endLocation[2] * 2) ** 2) ** 0.5
+        self.xBanger = float(
+            xBangerScore([xG], [technique], [endLocation[1]], [endLocation[2]])[0]
+        )
 
-        if distance > 5:
-            xBanger += 0.1
 
-        self.xBanger = round(xBanger, 2)
+def goalCandidates(game, goals):
+    """The TOP_K highest scoring goals of a game, as (xBanger, Banger inputs)."""
+    goals = goals.assign(
+        xBanger=xBangerScore(
+            goals["shot_xg"],
+            goals["shot_technique"],
+            goals["shot_end_y"],
+            goals["shot_end_z"],
+        )
+    )
+    goals = goals.sort_values("xBanger", ascending=False, kind="stable").head(TOP_K)
+    isHome = goals["team_name"] == game.home_team_name
+    opponents = np.where(isHome, game.away_team_name, game.home_team_name)
+    return [
+        (
+            row.xBanger,
+            dict(
+                playerName=row.player_name,
+                teamName=row.team_name,
+                opponentName=opponentName,
+                minute=f"{row.minute}:{row.second:02d}",
+                xG=round(row.shot_xg, 3),
+                location=[row.location_x, row.location_y],
+                endLocation=[row.shot_end_x, row.shot_end_y, row.shot_end_z],
+                technique=row.shot_technique,
+                bodyPart=row.shot_body_part,
+                playType=row.shot_type,
+            ),
+        )
+        for row, opponentName in zip(goals.itertuples(), opponents)
+    ]
 
 
-bangers = []
+# Matches stream in one at a time and only the TOP_K goals seen so far are
+# kept. Heap entries are (xBanger, -arrival) so that among equal scores the
+# earliest goal wins, as with a stable sort. Per-game candidates are cached,
+# so a refresh only reads new games.
+heap = []
+arrival = 0
+for competitionId, seasonId in SEASONS:
+    for _, candidates in iterSeasonPartials(
+        competitionId,
+        seasonId,
+        goalCandidates,
+        columns=GOAL_COLUMNS,
+        filters=[("type_name", "==", "Shot"), ("shot_outcome", "==", "Goal")],
+        cacheName="goalCandidates",
+        cacheParams=(GOAL_CANDIDATES_VERSION, TOP_K),
+    ):
+        for xBanger, candidate in candidates:
+            entry = (xBanger, -arrival, candidate)
+            arrival += 1
+            if len(heap) < TOP_K:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
 
-for gameId in tqdm(games, leave=False):
-    match = fetchMatch(gameId, load_360=True)
-    events = match.events
-    shots = events[events["type_name"] == "Shot"]
-    for i, row in shots.iterrows():
-        if row["extra"]["shot"]["outcome"]["name"] == "Goal":
-            teamName = row["team_name"]
-            if teamName == match.homeTeamName:
-                opponentName = match.awayTeamName
-            else:
-                opponentName = match.homeTeamName
-            goalMinute = f"{row['minute']}:{row['second']:02d}"
-            banger = Banger(
-                playerName=row["player_name"],
-                teamName=teamName,
-                opponentName=opponentName,
-                minute=goalMinute,
-                xG=round(row["extra"]["shot"]["statsbomb_xg"], 3),
-                location=row["location"],
-                endLocation=row["extra"]["shot"]["end_location"],
-                technique=row["extra"]["shot"]["technique"]["name"],
-                bodyPart=row["extra"]["shot"]["body_part"]["name"],
-                playType=row["extra"]["shot"]["type"]["name"],
-            )
-            bangers.append(banger)
-
-sortedBangers = sorted(bangers, key=lambda b: b.xBanger, reverse=True)
-bangersList = sortedBangers[0:8]
+bangersList = [
+    Banger(**candidate)
+    for _, _, candidate in sorted(heap, key=lambda e: e[:2], reverse=True)
+]
 
 fig = plt.figure(figsize=(10, 7), dpi=300)
 ax = plt.subplot()
@@ -0,0 +1,63 @@
+"""
+Microbenchmark of the events flattening in Loader.events against the previous
+DataFrame-of-dicts implementation, on an already downloaded events payload.
+
+Usage:
+    python test/eventsBenchmark.py [game_id]
+"""
+
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.loader import Loader
+
+GAME_ID = int(sys.argv[1]) if len(sys.argv) > 1 else 3795506  # EURO 2020 Final
+REPEAT = 10
+
+
+def legacyEventsFrame(loader, game_id, obj):
+    eventsdf = pd.DataFrame(loader._flatten_id(e) for e in obj)
+    eventsdf["match_id"] = game_id
+    eventsdf["timestamp"] = pd.to_timedelta(eventsdf["timestamp"])
+    eventsdf["related_events"] = eventsdf["related_events"].apply(
+        lambda d: d if isinstance(d, list) else []
+    )
+    eventsdf["under_pressure"] = eventsdf["under_pressure"].fillna(False).astype(bool)
+    eventsdf["counterpress"] = eventsdf["counterpress"].fillna(False).astype(bool)
+    eventsdf.rename(
+        columns={"id": "event_id", "period": "period_id", "match_id": "game_id"},
+        inplace=True,
+    )
+    return eventsdf
+
+
+def bestOf(fn):
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT))
+
+
+loader = Loader(creds={"user": "", "passwd": ""})
+obj = loader._events(GAME_ID)
+
+fastdf = loader._events_from(GAME_ID, obj)
+legacydf = legacyEventsFrame(loader, GAME_ID, obj)[fastdf.columns]
+pd.testing.assert_frame_equal(legacydf, fastdf)
+
+timestamps = [e["timestamp"] for e in obj]
+legacyFlatten = bestOf(lambda: legacyEventsFrame(loader, GAME_ID, obj))
+fastFlatten = bestOf(lambda: loader._events_from(GAME_ID, obj))
+legacyTimestamps = bestOf(lambda: pd.to_timedelta(timestamps))
+fastTimestamps = bestOf(lambda: loader._parse_timestamps(timestamps))
+
+print(f"Game {GAME_ID}: {len(obj)} events, outputs match")
+print(
+    f"Flattening: {legacyFlatten * 1000:.1f} ms -> {fastFlatten * 1000:.1f} ms "
+    f"({legacyFlatten / fastFlatten:.1f}x)"
+)
+print(
+    f"Timestamps: {legacyTimestamps * 1000:.2f} ms -> {fastTimestamps * 1000:.2f} ms "
+    f"({legacyTimestamps / fastTimestamps:.1f}x)"
+)
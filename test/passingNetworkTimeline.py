@@ -0,0 +1,105 @@
+"""
+Checks PassingNetworkTimeline windows around half-time, where first half
+stoppage time (45:xx, 46:xx) overlaps the start of the second half on the
+StatsBomb minute clock, on a synthetic pass stream.
+
+Usage:
+    python test/passingNetworkTimeline.py
+"""
+
+import os
+import sys
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.passingNetwork import (
+    PassingNetworkTimeline,
+    clockBoundaries,
+    matchClock,
+    substitutionTimes,
+)
+
+# (period, minute, second, passer, receiver)
+PASSES = [
+    (1, 10, 0, 1, 2),
+    (1, 44, 30, 2, 3),
+    (1, 45, 20, 3, 1),  # first half stoppage time
+    (1, 46, 10, 1, 3),
+    (1, 47, 5, 3, 2),
+    (2, 45, 5, 4, 5),  # second half kick-off
+    (2, 45, 40, 5, 4),
+    (2, 46, 30, 4, 5),
+    (2, 47, 30, 5, 6),
+    (2, 80, 0, 6, 4),
+]
+# (period, minute, second) of the substitutions
+SUBSTITUTIONS = [(2, 46, 0), (1, 46, 0)]
+
+
+def passesFrame(passes):
+    period, minute, second, passer, receiver = map(np.array, zip(*passes))
+    return pd.DataFrame(
+        {
+            "period_id": period,
+            "index": np.arange(len(passes)),
+            "minute": minute,
+            "second": second,
+            "player_id": passer.astype(float),
+            "player_name": [f"Player {p}" for p in passer],
+            "pass_recipient_id": receiver.astype(float),
+            "pass_recipient_name": [f"Player {r}" for r in receiver],
+            "location_x": np.full(len(passes), 60.0),
+            "location_y": np.full(len(passes), 40.0),
+        }
+    ).sample(frac=1, random_state=0)  # rows out of event order
+
+
+def passersInWindow(timeline, t0, t1):
+    nodes, _ = timeline.window(t0, t1)
+    return dict(zip(nodes["player_id"].astype(int), nodes["num_passes"]))
+
+
+timeline = PassingNetworkTimeline.fromPasses(passesFrame(PASSES))
+assert np.all(np.diff(timeline.times) >= 0)
+
+# The first half stoppage time only holds first half passes
+firstStoppage = passersInWindow(timeline, matchClock(1, 45, 0), matchClock(2, 45, 0))
+assert firstStoppage == {1: 1, 2: 0, 3: 2, 4: 0, 5: 0, 6: 0}, firstStoppage
+
+# 45:00 - 47:00 of the second half only holds second half passes
+secondStart = passersInWindow(timeline, matchClock(2, 45, 0), matchClock(2, 47, 0))
+assert secondStart == {1: 0, 2: 0, 3: 0, 4: 2, 5: 1, 6: 0}, secondStart
+
+# Windows every 15 minutes partition the match, stoppage time included
+boundaries = clockBoundaries(15)
+assert len(boundaries) == 7 and boundaries[3] == matchClock(2, 45, 0)
+windows = timeline.windows(boundaries)
+assert sum(w[2]["num_passes"].sum() for w in windows) == len(PASSES)
+assert windows[2][2]["num_passes"].sum() == 4  # 30:00 - end of first half
+assert windows[3][2]["num_passes"].sum() == 4  # 45:00 - 60:00 second half
+full = timeline.window(0, np.inf)[1]
+assert (sum(w[3] for w in windows) == full).all()
+
+# Substitutions are on the same clock, whatever the order they come in
+frame = pd.DataFrame(
+    {
+        "team_id": 1,
+        "type_name": "Substitution",
+        "period_id": [p for p, _, _ in SUBSTITUTIONS],
+        "minute": [m for _, m, _ in SUBSTITUTIONS],
+        "second": [s for _, _, s in SUBSTITUTIONS],
+    }
+)
+match = SimpleNamespace(table=SimpleNamespace(frame=frame))
+subs = substitutionTimes(match, 1)
+assert list(subs) == [matchClock(1, 46, 0), matchClock(2, 46, 0)], subs
+beforeFirstSub = passersInWindow(timeline, 0, subs[0])
+assert sum(beforeFirstSub.values()) == 3, beforeFirstSub
+betweenSubs = passersInWindow(timeline, subs[0], subs[1])
+assert sum(betweenSubs.values()) == 4, betweenSubs
+
+print("PassingNetworkTimeline: half-time windows ok")
@@ -0,0 +1,226 @@
+"""
+Checks Loader.extract_player_games against the previous row-wise
+implementation on a corpus of synthetic matches (regular time and extra
+time, stoppage time, red cards and second yellows for starters and
+substitutes, players subbed on and off), then benchmarks both.
+
+Downloaded games can be added to the corpus by id.
+
+Usage:
+    python test/playerGamesBenchmark.py [game_id ...]
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.loader import Loader
+
+N_MATCHES = 200
+REPEAT = 10
+TEAMS = [(1, "Home FC"), (2, "Away FC")]
+
+
+def legacyPlayerGames(loader, events):
+    # get duration of each period
+    periods = pd.DataFrame(
+        [
+            {"period_id": 1, "minute": 45},
+            {"period_id": 2, "minute": 45},
+            {"period_id": 3, "minute": 15},
+            {"period_id": 4, "minute": 15},
+            # Shoot-outs should not contritbute to minutes played
+            # {"period_id": 5, "minute": 0},
+        ]
+    ).set_index("period_id")
+    periods_minutes = (
+        events.loc[events.type_name == "Half End", ["period_id", "minute"]]
+        .drop_duplicates()
+        .set_index("period_id")
+        .sort_index()
+        .subtract(periods.cumsum().shift(1).fillna(0))
+        .minute.dropna()
+        .astype(int)
+        .tolist()
+    )
+    # get duration of entire match
+    game_minutes = sum(periods_minutes)
+
+    game_id = events.game_id.mode().values[0]
+    players = {}
+    # Red cards
+    red_cards = events[
+        events.apply(
+            lambda x: any(
+                e in x.extra
+                and "card" in x.extra[e]
+                and x.extra[e]["card"]["name"] in ["Second Yellow", "Red Card"]
+                for e in ["foul_committed", "bad_behaviour"]
+            ),
+            axis=1,
+        )
+    ]
+    # stats for starting XI
+    for startxi in events[events.type_name == "Starting XI"].itertuples():
+        team_id, team_name = startxi.team_id, startxi.team_name
+        for player in startxi.extra["tactics"]["lineup"]:
+            player = loader._flatten_id(player)
+            player = {
+                **player,
+                **{
+                    "game_id": game_id,
+                    "team_id": team_id,
+                    "team_name": team_name,
+                    "minutes_played": game_minutes,
+                },
+            }
+            player_red_card = red_cards[red_cards.player_id == player["player_id"]]
+            if len(player_red_card) > 0:
+                red_card_minute = player_red_card.iloc[0].minute
+                player["minutes_played"] = loader._expand_minute(
+                    red_card_minute, periods_minutes
+                )
+            players[player["player_id"]] = player
+    # stats for substitutions
+    for substitution in events[events.type_name == "Substitution"].itertuples():
+        exp_sub_minute = loader._expand_minute(substitution.minute, periods_minutes)
+        replacement = {
+            "player_id": substitution.extra["substitution"]["replacement"]["id"],
+            "player_name": substitution.extra["substitution"]["replacement"]["name"],
+            "minutes_played": game_minutes - exp_sub_minute,
+            "team_id": substitution.team_id,
+            "game_id": game_id,
+            "team_name": substitution.team_name,
+        }
+        player_red_card = red_cards[red_cards.player_id == replacement["player_id"]]
+        if len(player_red_card) > 0:
+            red_card_minute = player_red_card.iloc[0].minute
+            replacement["minutes_played"] = (
+                loader._expand_minute(red_card_minute, periods_minutes)
+                - exp_sub_minute
+            )
+        players[replacement["player_id"]] = replacement
+        players[substitution.player_id]["minutes_played"] = exp_sub_minute
+    pg = pd.DataFrame(players.values()).fillna(0)
+    for col in pg.columns:
+        if "_id" in col:
+            pg[col] = pg[col].astype(int)
+
+    return pg
+
+
+def syntheticMatch(game_id, seed, n_events=2000):
+    """
+    Events frame (the columns extract_player_games reads) of a random match.
+    """
+    rng = np.random.default_rng(seed)
+    extra_time = rng.random() < 0.3
+    # (period, first minute, last minute including stoppage time)
+    periods = [(1, 0, 45 + rng.integers(0, 5)), (2, 45, 90 + rng.integers(0, 8))]
+    if extra_time:
+        periods += [
+            (3, 90, 105 + rng.integers(0, 3)),
+            (4, 105, 120 + rng.integers(0, 4)),
+        ]
+
+    events = []
+
+    def event(type_name, period, minute, team, player_id=None, extra=None):
+        events.append(
+            {
+                "game_id": game_id,
+                "type_name": type_name,
+                "period_id": period,
+                "minute": int(minute),
+                "team_id": team[0],
+                "team_name": team[1],
+                "player_id": np.nan if player_id is None else float(player_id),
+                "extra": extra or {},
+            }
+        )
+
+    onPitch = {}
+    for team in TEAMS:
+        lineup = [
+            {
+                "player": {"id": team[0] * 100 + j, "name": f"Player {team[0]}-{j}"},
+                "position": {"id": j + 1, "name": f"Position {j + 1}"},
+                "jersey_number": j + 1,
+            }
+            for j in range(11)
+        ]
+        event("Starting XI", 1, 0, team, extra={"tactics": {"lineup": lineup}})
+        onPitch[team] = [team[0] * 100 + j for j in range(11)]
+
+    # Random events minute by minute, with substitutions and cards
+    bench = {team: [team[0] * 100 + j for j in range(11, 20)] for team in TEAMS}
+    sentOff = set()
+    for period, start, end in periods:
+        for minute in np.sort(rng.integers(start, end + 1, n_events // len(periods))):
+            team = TEAMS[rng.integers(0, 2)]
+            player = onPitch[team][rng.integers(0, len(onPitch[team]))]
+            roll = rng.random()
+            if roll < 0.004 and bench[team] and period > 1:
+                replacement = bench[team].pop()
+                onPitch[team].remove(player)
+                onPitch[team].append(replacement)
+                event(
+                    "Substitution",
+                    period,
+                    minute,
+                    team,
+                    player,
+                    {
+                        "substitution": {
+                            "replacement": {
+                                "id": replacement,
+                                "name": f"Player {team[0]}-{replacement % 100}",
+                            }
+                        }
+                    },
+                )
+            elif roll < 0.006 and player not in sentOff:
+                kind, card = (
+                    ("Foul Committed", "foul_committed")
+                    if rng.random() < 0.5
+                    else ("Bad Behaviour", "bad_behaviour")
+                )
+                name = ["Yellow Card", "Second Yellow", "Red Card"][rng.integers(0, 3)]
+                if name != "Yellow Card":
+                    sentOff.add(player)
+                    onPitch[team].remove(player)
+                extra = {card: {"card": {"name": name}}}
+                event(kind, period, minute, team, player, extra)
+            else:
+                event("Pass", period, minute, team, player)
+        for team in TEAMS:
+            event("Half End", period, end, team)
+
+    return pd.DataFrame(events)
+
+
+def bestOf(fn):
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT))
+
+
+loader = Loader(creds={"user": "", "passwd": ""})
+corpus = [syntheticMatch(1000 + seed, seed) for seed in range(N_MATCHES)]
+corpus += [loader.events(int(gameId)) for gameId in sys.argv[1:]]
+
+for events in corpus:
+    legacy = legacyPlayerGames(loader, events)
+    fast = loader.extract_player_games(events)
+    pd.testing.assert_frame_equal(legacy, fast)
+
+events = corpus[-1]
+legacyTime = bestOf(lambda: legacyPlayerGames(loader, events))
+fastTime = bestOf(lambda: loader.extract_player_games(events))
+print(f"{len(corpus)} matches, outputs match")
+print(
+    f"extract_player_games ({len(events)} events): {legacyTime * 1000:.1f} ms -> "
+    f"{fastTime * 1000:.1f} ms ({legacyTime / fastTime:.1f}x)"
+)
@@ -0,0 +1,219 @@
+"""
+Checks prefetchSeason's retries and reported failures without network
+access. The statsbombpy calls the Loader makes (sb.matches, sb.events,
+sb.lineups, sb.frames) are stubbed, so games go through the real Loader
+and are written to a MatchStore in a temporary folder.
+
+Transient errors are retried, client errors (HTTP 4xx other than 429) and
+malformed payloads are not, every game that cannot be stored is reported
+as failed without stopping the others, and games already in the store are
+not downloaded again.
+
+Usage:
+    python test/prefetchSeasonCheck.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+from requests import Response
+from requests.exceptions import ConnectionError, HTTPError
+from statsbombpy import sb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.commons import getStatsbombAPI, prefetchSeason
+from utils.loader import MetadataCache
+from utils.store import MatchStore
+
+COMPETITION_ID = 9999
+SEASON_ID = 9999
+RETRIES = 2
+TEAMS = {1: "Home FC", 2: "Away FC"}
+STORED = 7
+
+
+def httpError(status):
+    response = Response()
+    response.status_code = status
+    return HTTPError(f"{status} error", response=response)
+
+
+# game id -> the errors its downloads raise, in order, before one succeeds
+ERRORS = {
+    1: [],
+    2: [ConnectionError("connection reset")],
+    3: [httpError(503)] * (RETRIES + 1),
+    4: [httpError(404)],
+    5: [httpError(429)] * RETRIES,
+    6: [],  # lineups with a single team
+    STORED: [],
+}
+MALFORMED = {6}
+
+
+def event(index, period, minute, teamId, typeName, **extra):
+    team = {"id": teamId, "name": TEAMS[teamId]}
+    return {
+        "id": f"event-{index}",
+        "index": index,
+        "period": period,
+        "timestamp": f"00:{minute % 45:02d}:00.000",
+        "minute": minute,
+        "second": 0,
+        "type": {"id": index, "name": typeName},
+        "possession": 1,
+        "possession_team": team,
+        "play_pattern": {"id": 1, "name": "Regular Play"},
+        "team": team,
+        **extra,
+    }
+
+
+def players(teamId):
+    return [{"id": teamId * 100 + j, "name": f"Player {teamId}-{j}"} for j in range(11)]
+
+
+def eventsPayload():
+    events = [
+        event(
+            teamId,
+            1,
+            0,
+            teamId,
+            "Starting XI",
+            tactics={
+                "formation": 442,
+                "lineup": [
+                    {
+                        "player": player,
+                        "position": {"id": j + 1, "name": f"Position {j + 1}"},
+                        "jersey_number": j + 1,
+                    }
+                    for j, player in enumerate(players(teamId))
+                ],
+            },
+        )
+        for teamId in TEAMS
+    ]
+    for period, minute in ((1, 45), (2, 90)):
+        for teamId in TEAMS:
+            events.append(event(len(events) + 1, period, minute, teamId, "Half End"))
+    return {e["id"]: e for e in events}
+
+
+def lineupsPayload(teamIds):
+    return {
+        teamId: {
+            "team_id": teamId,
+            "team_name": TEAMS[teamId],
+            "lineup": [
+                {
+                    "player_id": player["id"],
+                    "player_name": player["name"],
+                    "player_nickname": None,
+                    "jersey_number": j + 1,
+                    "country": {"id": 1, "name": "Country"},
+                    "cards": [],
+                    "positions": [],
+                }
+                for j, player in enumerate(players(teamId))
+            ],
+        }
+        for teamId in teamIds
+    }
+
+
+class StubStatsbomb:
+    """Stand-ins for the statsbombpy calls, counting the events downloads."""
+
+    def __init__(self, errors):
+        self.errors = {gameId: list(e) for gameId, e in errors.items()}
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def matches(self, competition_id, season_id, fmt="dict", creds=None):
+        return {
+            gameId: {
+                "match_id": gameId,
+                "match_date": "2020-01-01",
+                "kick_off": "20:00:00.000",
+                "competition": {
+                    "competition_id": competition_id,
+                    "competition_name": "Cup",
+                },
+                "season": {"season_id": season_id, "season_name": "2020"},
+                "competition_stage": {"id": 1, "name": "Final"},
+                "home_team": {"home_team_id": 1, "home_team_name": TEAMS[1]},
+                "away_team": {"away_team_id": 2, "away_team_name": TEAMS[2]},
+                "home_score": 0,
+                "away_score": 0,
+                "match_week": 1,
+            }
+            for gameId in self.errors
+        }
+
+    def events(self, match_id, fmt="dict", creds=None):
+        with self.lock:
+            self.calls[match_id] = self.calls.get(match_id, 0) + 1
+            if self.errors[match_id]:
+                raise self.errors[match_id].pop(0)
+        return eventsPayload()
+
+    def lineups(self, match_id, fmt="dict", creds=None):
+        return lineupsPayload([1] if match_id in MALFORMED else [1, 2])
+
+    def frames(self, match_id, fmt="dict", creds=None):
+        return []
+
+
+stub = StubStatsbomb(ERRORS)
+sb.matches, sb.events, sb.lineups, sb.frames = (
+    stub.matches,
+    stub.events,
+    stub.lineups,
+    stub.frames,
+)
+
+tmp = tempfile.TemporaryDirectory()
+store = MatchStore(root=os.path.join(tmp.name, "match_store"))
+api = getStatsbombAPI()
+metadata = MetadataCache(api, cache_dir=os.path.join(tmp.name, "metadata_cache"))
+
+store.write(STORED, *api.match_bundle(STORED, load_360=True), load_360=True)
+stub.calls = {}
+
+failed = prefetchSeason(
+    COMPETITION_ID,
+    SEASON_ID,
+    workers=4,
+    retries=RETRIES,
+    backoff=0,
+    store=store,
+    api=api,
+    metadata=metadata,
+)
+assert sorted(failed) == [3, 4, 6], failed
+stored = [gameId for gameId in ERRORS if store.has(gameId, load_360=True)]
+assert stored == [1, 2, 5, STORED], stored
+expectedCalls = {1: 1, 2: 2, 3: RETRIES + 1, 4: 1, 5: RETRIES + 1, 6: 1}
+assert stub.calls == expectedCalls, stub.calls
+assert len(store.read_events(2)) == len(eventsPayload())
+
+# A second pass only downloads the games that failed
+stub.calls = {}
+failed = prefetchSeason(
+    COMPETITION_ID,
+    SEASON_ID,
+    retries=0,
+    backoff=0,
+    store=store,
+    api=api,
+    metadata=metadata,
+)
+assert sorted(failed) == [6], failed
+assert stub.calls == {3: 1, 4: 1, 6: 1}, stub.calls
+
+tmp.cleanup()
+print("prefetchSeason: retries and failures ok")
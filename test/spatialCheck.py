@@ -0,0 +1,183 @@
+"""
+Checks the batched PlayerFrames queries against plain Python loops over
+each frame, on random 360 frames and shot freeze frames. About a third of
+the 360 frames have no visible actor, hence a NaN origin, which must count
+no players in any query.
+
+Usage:
+    python test/spatialCheck.py
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.frames360 import Frames360
+from utils.spatial import LEFT_POST, RIGHT_POST, PlayerFrames
+
+N_FRAMES = 500
+RADIUS = 10
+HALF_ANGLE = 20
+GOAL = (120, 40)
+
+
+def randomFrames360(rng, n_frames):
+    frames = []
+    for i in range(n_frames):
+        n_players = rng.integers(0, 23)
+        hasActor = n_players > 0 and rng.random() < 0.65
+        frames.append(
+            {
+                "event_uuid": f"event-{i}",
+                "freeze_frame": [
+                    {
+                        "location": [rng.uniform(0, 120), rng.uniform(0, 80)],
+                        "teammate": bool(rng.random() < 0.5) or j == 0 and hasActor,
+                        "actor": j == 0 and hasActor,
+                        "keeper": bool(rng.random() < 0.1),
+                    }
+                    for j in range(n_players)
+                ],
+            }
+        )
+    return Frames360.fromFrames(frames)
+
+
+def randomShots(rng, n_shots):
+    return pd.DataFrame(
+        {
+            "event_id": [f"shot-{i}" for i in range(n_shots)],
+            "location_x": rng.uniform(80, 120, n_shots),
+            "location_y": rng.uniform(10, 70, n_shots),
+            "extra": [
+                {
+                    "shot": {
+                        "freeze_frame": [
+                            {
+                                "location": [rng.uniform(60, 120), rng.uniform(0, 80)],
+                                "teammate": bool(rng.random() < 0.4),
+                                "position": {
+                                    "name": "Goalkeeper"
+                                    if rng.random() < 0.1
+                                    else "Center Back"
+                                },
+                            }
+                            for _ in range(rng.integers(0, 15))
+                        ]
+                    }
+                }
+                for _ in range(n_shots)
+            ],
+        }
+    )
+
+
+def players(frames, i, teammate=None, keeper=None):
+    """(x, y) of the players a query looks at in frame i."""
+    return [
+        tuple(frames.xy[row])
+        for row in range(frames.offsets[i], frames.offsets[i + 1])
+        if not frames.actor[row]
+        and (teammate is None or frames.teammate[row] == teammate)
+        and (keeper is None or frames.keeper[row] == keeper)
+    ]
+
+
+def side(p, q, r):
+    return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+
+
+def loopWithinRadius(frames, radius):
+    counts = []
+    for i, origin in enumerate(frames.origin):
+        counts.append(
+            sum(math.dist(origin, p) <= radius for p in players(frames, i))
+            if not np.isnan(origin).any()
+            else 0
+        )
+    return counts
+
+
+def loopBetweenGoal(frames):
+    counts = []
+    for i, origin in enumerate(frames.origin):
+        count = 0
+        if not np.isnan(origin).any():
+            for p in players(frames, i, teammate=False):
+                sides = [
+                    side(origin, LEFT_POST, p),
+                    side(LEFT_POST, RIGHT_POST, p),
+                    side(RIGHT_POST, origin, p),
+                ]
+                count += not (min(sides) < 0 < max(sides))
+        counts.append(count)
+    return counts
+
+
+def loopInCone(frames, target, halfAngle):
+    counts = []
+    for i, origin in enumerate(frames.origin):
+        count = 0
+        toTarget = np.subtract(target, origin)
+        for p in players(frames, i) if not np.isnan(origin).any() else []:
+            toPlayer = np.subtract(p, origin)
+            norms = np.hypot(*toPlayer) * np.hypot(*toTarget)
+            if norms > 0:
+                count += np.dot(toPlayer, toTarget) / norms >= math.cos(
+                    math.radians(halfAngle)
+                )
+        counts.append(count)
+    return counts
+
+
+def loopNearest(frames, k):
+    distances = np.full((len(frames), k), np.inf)
+    for i, origin in enumerate(frames.origin):
+        if np.isnan(origin).any():
+            continue
+        nearest = sorted(math.dist(origin, p) for p in players(frames, i))[:k]
+        distances[i, : len(nearest)] = nearest
+    return distances
+
+
+def check(frames, name):
+    assert list(frames.countWithinRadius(RADIUS)) == loopWithinRadius(frames, RADIUS)
+    assert list(frames.countBetweenGoal()) == loopBetweenGoal(frames)
+    assert list(frames.countInCone(GOAL, HALF_ANGLE)) == loopInCone(
+        frames, GOAL, HALF_ANGLE
+    )
+    distances, rows = frames.nearest(k=3)
+    assert np.allclose(distances, loopNearest(frames, 3))
+    assert ((rows == -1) == np.isinf(distances)).all()
+    print(f"{name}: {len(frames)} frames, queries match the loops")
+
+
+rng = np.random.default_rng(0)
+
+# Two opponents and no actor: the frame has no origin and counts no players
+noActor = Frames360.fromFrames(
+    [
+        {
+            "event_uuid": "no-actor",
+            "freeze_frame": [
+                {"location": [110, 39], "teammate": False, "actor": False, "keeper": k}
+                for k in (False, True)
+            ],
+        }
+    ]
+)
+frames = PlayerFrames.fromFrames360(noActor)
+assert np.isnan(frames.origin).all()
+assert list(frames.countBetweenGoal()) == [0]
+assert list(frames.countInTriangle((100, 40), LEFT_POST, RIGHT_POST)) == [2]
+
+frames360 = PlayerFrames.fromFrames360(randomFrames360(rng, N_FRAMES))
+assert np.isnan(frames360.origin[:, 0]).sum() > N_FRAMES // 4
+check(frames360, "360 frames")
+shotFrames = PlayerFrames.fromShots(randomShots(rng, N_FRAMES))
+check(shotFrames, "shot freeze frames")
+check(PlayerFrames.concat([frames360, shotFrames]), "concatenated frames")
@@ -1,7 +1,11 @@
 from .commons import (
     getStatsbombAPI,
+    getMetadataCache,
     saveFigure,
     fetchMatch,
+    loadEvents,
+    loadEventsMany,
+    prefetchSeason,
     getRandomMatchId,
     getRandomCompetitionAndSeasonIds,
     getAllMatchesFromSeason,
@@ -9,9 +13,16 @@ from .commons import (
     getTeamsBySeason,
     normalizeString,
     count_in_pitch_zones,
+    drawZoneHeatmap,
+    ZoneLabels,
     make_matplotlib_grid,
 )
+from .binning import binStatistic, transitionMatrix, zoneIndex
+from .scoring import xBangerScore
+from .shotGeometry import mirrorCoordinates, shotGeometry
 from .fullPitch import FullPitch
 from .halfPitch import HalfPitch
-from .loader import Loader
+from .loader import Loader, MetadataCache
+from .logos import LogoCache
+from .store import MatchStore
 from .config import *
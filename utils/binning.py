@@ -0,0 +1,173 @@
+"""
+
+Binned statistics over regular pitch grids.
+
+Points are mapped to a flat zone index (row * zones_x + column) and reduced
+with np.bincount, optionally offset by a group code so many teams or matches
+are binned in a single pass. Points outside [0, pitch_w) x [0, pitch_h),
+including negative coordinates, are dropped.
+
+"""
+
+import numpy as np
+
+STATISTICS = ("count", "sum", "mean")
+
+
+def zoneIndex(x, y, zones_x, zones_y, pitch_w=120, pitch_h=80):
+    """
+    Map (x, y) coordinates to flat zone indices.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Coordinates, y already adjusted for orientation.
+    zones_x, zones_y : int
+        Number of horizontal and vertical zones.
+    pitch_w, pitch_h : float, optional
+        Pitch size in coordinate units. Default is 120x80 (StatsBomb).
+
+    Returns
+    -------
+    index : np.ndarray
+        Flat zone index (row * zones_x + column) of every point.
+    valid : np.ndarray
+        Boolean mask of the points inside the pitch; index is meaningless
+        where it is False.
+    """
+    zx = np.floor_divide(np.asarray(x, dtype=float), pitch_w / zones_x)
+    zy = np.floor_divide(np.asarray(y, dtype=float), pitch_h / zones_y)
+    valid = (zx >= 0) & (zx < zones_x) & (zy >= 0) & (zy < zones_y)
+    index = np.where(valid, zy * zones_x + zx, 0).astype(np.intp)
+    return index, valid
+
+
+def _reduce(index, valid, n_bins, values, weights, statistic, groups, n_groups):
+    if statistic not in STATISTICS:
+        raise ValueError(
+            f"Unknown statistic: {statistic}, expected one of {STATISTICS}"
+        )
+    if statistic != "count" and values is None:
+        raise ValueError(f"The '{statistic}' statistic requires values")
+
+    if groups is not None:
+        groups = np.asarray(groups, dtype=np.intp)
+        if n_groups is None:
+            n_groups = int(groups.max()) + 1 if len(groups) else 0
+        valid = valid & (groups >= 0) & (groups < n_groups)
+        index = groups * n_bins + index
+        size = n_groups * n_bins
+    else:
+        size = n_bins
+
+    index = index[valid]
+    w = None if weights is None else np.asarray(weights, dtype=float)[valid]
+    if statistic == "count":
+        result = np.bincount(index, weights=w, minlength=size).astype(float)
+    else:
+        v = np.asarray(values, dtype=float)[valid]
+        result = np.bincount(index, weights=v if w is None else v * w, minlength=size)
+        if statistic == "mean":
+            total = np.bincount(index, weights=w, minlength=size)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = result / total
+
+    return result if groups is None else result.reshape(n_groups, n_bins)
+
+
+def binStatistic(
+    x,
+    y,
+    zones_x,
+    zones_y,
+    values=None,
+    weights=None,
+    statistic="count",
+    groups=None,
+    n_groups=None,
+    pitch_w=120,
+    pitch_h=80,
+):
+    """
+    Compute a statistic of the points falling in each zone of a grid.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Coordinates, y already adjusted for orientation (e.g. 80 - raw_y for
+        StatsBomb data).
+    zones_x, zones_y : int
+        Number of horizontal and vertical zones.
+    values : np.ndarray, optional
+        Value of every point (e.g. xG, pass length), required by "sum" and
+        "mean".
+    weights : np.ndarray, optional
+        Weight of every point. "count" becomes the sum of weights, "sum" the
+        weighted sum and "mean" the weighted mean of values.
+    statistic : {"count", "sum", "mean"}, optional
+        Default is "count". Empty zones have a NaN mean.
+    groups : np.ndarray, optional
+        Integer group code (0 .. n_groups - 1) of every point, e.g. from
+        pd.factorize on team names or game ids. Points of every group are
+        binned in the same pass.
+    n_groups : int, optional
+        Number of groups. Default is the largest group code + 1.
+    pitch_w, pitch_h : float, optional
+        Pitch size in coordinate units. Default is 120x80 (StatsBomb).
+
+    Returns
+    -------
+    np.ndarray
+        A (zones_y, zones_x) array, or (n_groups, zones_y, zones_x) when
+        groups is given.
+    """
+    index, valid = zoneIndex(x, y, zones_x, zones_y, pitch_w, pitch_h)
+    result = _reduce(
+        index, valid, zones_x * zones_y, values, weights, statistic, groups, n_groups
+    )
+    return result.reshape(result.shape[:-1] + (zones_y, zones_x))
+
+
+def transitionMatrix(
+    x,
+    y,
+    end_x,
+    end_y,
+    zones_x,
+    zones_y,
+    values=None,
+    weights=None,
+    statistic="count",
+    groups=None,
+    n_groups=None,
+    pitch_w=120,
+    pitch_h=80,
+):
+    """
+    Compute a statistic of the moves (e.g. passes, carries) between each pair
+    of zones. Moves starting or ending outside the pitch are dropped.
+
+    Parameters are the same as binStatistic, with end_x and end_y the end
+    coordinates of every move.
+
+    Returns
+    -------
+    np.ndarray
+        A (n_zones, n_zones) array indexed by [start zone, end zone], with
+        n_zones = zones_x * zones_y and zones numbered row * zones_x + column,
+        or (n_groups, n_zones, n_zones) when groups is given.
+    """
+    start, valid_start = zoneIndex(x, y, zones_x, zones_y, pitch_w, pitch_h)
+    end, valid_end = zoneIndex(end_x, end_y, zones_x, zones_y, pitch_w, pitch_h)
+    n_zones = zones_x * zones_y
+    result = _reduce(
+        start * n_zones + end,
+        valid_start & valid_end,
+        n_zones * n_zones,
+        values,
+        weights,
+        statistic,
+        groups,
+        n_groups,
+    )
+    return result.reshape(result.shape[:-1] + (n_zones, n_zones))
@@ -1,19 +1,23 @@
 import math
+import time
 import warnings
 import random
 import unicodedata
-import os
-import pickle
-import hashlib
 import numpy as np
+import matplotlib.artist as martist
+import matplotlib.colors as mcolors
+import matplotlib.text as mtext
 import matplotlib.pyplot as plt
 import urllib.request
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image
 from statsbombpy.api_client import NoAuthWarning
-from .loader import Loader
-from requests.exceptions import HTTPError
-from models import Match
+from tqdm import tqdm
+from .binning import binStatistic
+from .loader import Loader, MetadataCache
+from .store import MatchStore
+from requests.exceptions import HTTPError, RequestException
 
 warnings.simplefilter("ignore", NoAuthWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -25,62 +29,195 @@ def getStatsbombAPI():
     return api
 
 
-def _get_cache_path(gameId):
-    CACHE_DIR = "match_cache"
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    key = f"match_{gameId}"
-    filename = hashlib.md5(key.encode()).hexdigest() + ".pkl"
-    return os.path.join(CACHE_DIR, filename)
+def getMetadataCache():
+    return MetadataCache(getStatsbombAPI())
 
 
 def fetchMatch(gameId, load_360=True):
     """
     Fetches events, players, and teams from the API and creates a Match object.
+    Fetched matches are kept in the columnar match store, and the returned
+    Match reads its events and players back from disk only when accessed.
 
     Parameters:
     - gameId: The ID of the game to fetch data for.
-    - api: The StatsBomb API instance.
-    - folder: The base folder to store images or outputs.
     - load_360: Whether to load 360-degree data (default: True).
 
     Returns:
     - match: The Match object created using fetched data.
-    - folder_path: The path where match-related images or outputs can be stored.
     """
 
-    cache_path = _get_cache_path(gameId)
+    store = MatchStore()
+    _ensureStored(gameId, load_360, store)
+
+    return store.read_match(gameId)
+
+
+def _ensureStored(gameId, load_360, store, api=None):
+    if store.has(gameId, load_360=load_360):
+        return
+
+    api = api or getStatsbombAPI()
+    if store.has(gameId):
+        # Stored without 360 data: only the frames are missing
+        try:
+            frames = api.frames(gameId)
+        except HTTPError:
+            frames = None
+        store.write_frames_360(gameId, frames)
+        return
+
+    # Fetch match events, players, teams and 360 frames in a single pass
+    matchEvents, teams, players, frames = api.match_bundle(gameId, load_360=load_360)
+    store.write(gameId, matchEvents, teams, players, frames, load_360=load_360)
+
+
+def _isClientError(error):
+    # 4xx responses (e.g. a game that is not available) fail the same way on
+    # every retry, except 429 Too Many Requests
+    response = getattr(error, "response", None)
+    if response is None:
+        return False
+    return 400 <= response.status_code < 500 and response.status_code != 429
+
+
+def _ensureStoredWithRetries(gameId, load_360, store, api, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            _ensureStored(gameId, load_360, store, api)
+            return
+        except RequestException as e:
+            if attempt == retries or _isClientError(e):
+                raise
+            time.sleep(backoff * 2**attempt)
+
+
+def prefetchSeason(
+    competitionId,
+    seasonId,
+    workers=8,
+    retries=3,
+    backoff=1.0,
+    load_360=True,
+    store=None,
+    api=None,
+    metadata=None,
+):
+    """
+    Warms the match store with every game of a season, downloading the missing
+    games concurrently through a bounded thread pool.
+
+    Parameters:
+    - competitionId: The ID of the competition.
+    - seasonId: The ID of the season.
+    - workers: Maximum number of games downloaded at the same time (default: 8).
+    - retries: How many times a failed download is retried (default: 3).
+      Client errors (HTTP 4xx other than 429) are not retried.
+    - backoff: Seconds to wait before the first retry, doubled on every
+      further retry (default: 1.0).
+    - load_360: Whether to load 360-degree data (default: True).
+    - store: The MatchStore to warm (default: MatchStore()).
+    - api: The Loader games are downloaded with (default: a new
+      getStatsbombAPI() Loader for every game).
+    - metadata: The MetadataCache the season's games are listed from
+      (default: one reading through api).
+
+    Returns:
+    - failed: The IDs of the games that could not be fetched or stored, for
+      network errors as well as any other error (e.g. a malformed payload);
+      the other games are still fetched.
+    """
 
-    if os.path.exists(cache_path):
-        with open(cache_path, "rb") as f:
-            return pickle.load(f)
+    store = store or MatchStore()
+    metadata = metadata or MetadataCache(api or getStatsbombAPI())
+    games = [
+        gameId
+        for gameId in metadata.season_index(competitionId, seasonId)["games"]
+        if not store.has(gameId, load_360=load_360)
+    ]
 
-    api = getStatsbombAPI()
-    # Fetch match events, players, and teams
-    try:
-        matchEvents = api.events(gameId, load_360=load_360)
-    except HTTPError:
-        matchEvents = api.events(gameId, load_360=False)
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                _ensureStoredWithRetries,
+                gameId,
+                load_360,
+                store,
+                api,
+                retries,
+                backoff,
+            ): gameId
+            for gameId in games
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), leave=False):
+            try:
+                future.result()
+            except Exception:
+                failed.append(futures[future])
+
+    return failed
+
+
+def loadEvents(gameId, columns=None, filters=None, load_360=True):
+    """
+    Reads only the requested columns and rows of a match's events from the
+    match store, fetching the match first if it has not been stored yet.
 
-    players = api.players(gameId)
-    teams = api.teams(gameId)
+    Parameters:
+    - gameId: The ID of the game to read events for.
+    - columns: The event columns to read (default: all). Besides the Loader.events
+      columns, the store exposes the typed EventTable columns flattened out of
+      the extra dict (e.g. pass_end_x, pass_success, shot_xg), see
+      models.eventTable.EXTRA_FIELDS, and the shot geometry columns of
+      utils.shotGeometry.SHOT_GEOMETRY_COLUMNS.
+    - filters: Row filters in pyarrow syntax, e.g. [("type_name", "==", "Pass")].
+    - load_360: Whether to load 360-degree data if the match must be fetched.
 
-    # Create and return the Match object
-    match = Match(gameId, matchEvents, teams, players)
+    Returns:
+    - events: A DataFrame with the selected events and columns.
+    """
 
-    with open(cache_path, "wb") as f:
-        pickle.dump(match, f)
+    store = MatchStore()
+    if not store.has(gameId):
+        _ensureStored(gameId, load_360, store)
 
-    return match
+    return store.read_events(gameId, columns=columns, filters=filters)
+
+
+def loadEventsMany(gameIds, columns=None, filters=None, load_360=True):
+    """
+    Reads the requested columns and rows of the events of many matches in a
+    single columnar query, fetching the matches that have not been stored yet.
+
+    Parameters:
+    - gameIds: The IDs of the games to read events for.
+    - columns: The event columns to read (default: all), see loadEvents.
+      Include "game_id" to tell the games apart.
+    - filters: Row filters in pyarrow syntax, e.g. [("type_name", "==", "Shot")].
+    - load_360: Whether to load 360-degree data if a match must be fetched.
+
+    Returns:
+    - events: A DataFrame with the selected events and columns of every game,
+      in the order of gameIds.
+    """
+
+    store = MatchStore()
+    for gameId in gameIds:
+        if not store.has(gameId):
+            _ensureStored(gameId, load_360, store)
+
+    return store.read_events_many(gameIds, columns=columns, filters=filters)
 
 
 def getRandomMatchId(seed=None):
     if seed is not None:
         random.seed(seed)
 
-    api = getStatsbombAPI()
-    competitions = api.competitions()
+    metadata = getMetadataCache()
+    competitions = metadata.competitions()
     randomRow = competitions.sample(n=1, random_state=random.randint(0, 10000)).iloc[0]
-    games = api.games(randomRow.competition_id, randomRow.season_id)
+    games = metadata.games(randomRow.competition_id, randomRow.season_id)
     randomGame = games.sample(n=1, random_state=random.randint(0, 10000)).iloc[0]
     return randomGame.game_id
 
@@ -89,28 +226,24 @@ def getRandomCompetitionAndSeasonIds(seed=None):
     if seed is not None:
         random.seed(seed)
 
-    api = getStatsbombAPI()
-    competitions = api.competitions()
+    competitions = getMetadataCache().competitions()
     randomRow = competitions.sample(n=1, random_state=random.randint(0, 10000)).iloc[0]
     return randomRow.competition_id, randomRow.season_id
 
 
 def getAllMatchesFromSeason(competitionId, seasonId):
-    games = getStatsbombAPI().games(competition_id=competitionId, season_id=seasonId)
-    return list(games["game_id"])
+    index = getMetadataCache().season_index(competitionId, seasonId)
+    return list(index["games"])
 
 
 def getTeamsBySeason(competitionId, seasonId):
-    games = getStatsbombAPI().games(competition_id=competitionId, season_id=seasonId)
-    return list(games["home_team_name"].unique())
+    index = getMetadataCache().season_index(competitionId, seasonId)
+    return list(index["teams"])
 
 
 def getTeamMatchesFromSeason(competitionId, seasonId, teamName):
-    games = getStatsbombAPI().games(competition_id=competitionId, season_id=seasonId)
-    games = games[
-        games[["home_team_name", "away_team_name"]].isin([teamName]).any(axis=1)
-    ]
-    return list(games["game_id"])
+    index = getMetadataCache().season_index(competitionId, seasonId)
+    return list(index["team_games"].get(teamName, []))
 
 
 def saveFigure(fig, filename, dpi=300):
@@ -152,14 +285,145 @@ def count_in_pitch_zones(x, y, zones_x, zones_y, pitch_w=120, pitch_h=80):
         A (zones_y, zones_x) array where each cell contains the count of
         coordinates that fell within that zone. Coordinates outside the
         pitch boundaries are excluded.
+
+    See utils.binning.binStatistic for sums, means, weights and batches of
+    groups.
+    """
+    return binStatistic(x, y, zones_x, zones_y, pitch_w=pitch_w, pitch_h=pitch_h)
+
+
+class ZoneLabels(martist.Artist):
+    """
+    Many text labels as a single artist.
+
+    One Text holds the shared properties and is moved to every label when
+    drawn, so thousands of labels (e.g. a 60x40 zone grid) cost one artist
+    instead of one Text each to create, lay out and draw.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Label positions, in data coordinates unless a transform is given.
+    texts : array-like
+        Label strings.
+    **text_kwargs
+        Text properties shared by every label, as for ax.text.
+    """
+
+    def __init__(self, x, y, texts, **text_kwargs):
+        super().__init__()
+        self._positions = np.column_stack([x, y])
+        self._texts = [str(t) for t in texts]
+        transform = text_kwargs.pop("transform", None)
+        self._text = mtext.Text(clip_on=False, **text_kwargs)
+        self.set_zorder(self._text.get_zorder())
+        if transform is not None:
+            self.set_transform(transform)
+
+    def set_figure(self, fig):
+        super().set_figure(fig)
+        self._text.set_figure(fig)
+
+    def set_transform(self, t):
+        super().set_transform(t)
+        self._text.set_transform(t)
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        for position, text in zip(self._positions, self._texts):
+            self._text.set_position(position)
+            self._text.set_text(text)
+            self._text.draw(renderer)
+        self.stale = False
+
+
+def drawZoneHeatmap(
+    ax,
+    counts,
+    color,
+    edgecolor=None,
+    linewidth=0.2,
+    labels=None,
+    label_kwargs=None,
+    origin="lower",
+    pitch_w=120,
+    pitch_h=80,
+    zorder=9,
+):
+    """
+    Draw a grid of zone counts (e.g. from count_in_pitch_zones) as a single
+    QuadMesh, each cell filled with color at an alpha proportional to its
+    count, plus optional text labels drawn by a single ZoneLabels artist.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+    counts : np.ndarray
+        A (zones_y, zones_x) array of counts.
+    color : color
+        Fill color of the cells.
+    edgecolor : color, optional
+        Cell border color, faded with the cell like the fill. Default is no
+        border.
+    linewidth : float, optional
+        Cell border width. Default is 0.2.
+    labels : np.ndarray, optional
+        A (zones_y, zones_x) array of strings drawn at the cell centers.
+        Empty strings are skipped.
+    label_kwargs : dict, optional
+        Text properties of the labels, as for ax.text.
+    origin : {"lower", "upper"}, optional
+        Whether row 0 of counts is drawn at the bottom (y from 0 up, as
+        binned by count_in_pitch_zones) or at the top of the pitch.
+    pitch_w : float, optional
+        Total pitch width in coordinate units. Default is 120 (StatsBomb).
+    pitch_h : float, optional
+        Total pitch height in coordinate units. Default is 80 (StatsBomb).
+    zorder : float, optional
+        Drawing order of the cells; labels are drawn above. Default is 9.
+
+    Returns
+    -------
+    matplotlib.collections.QuadMesh
     """
-    rect_x, rect_y = pitch_w / zones_x, pitch_h / zones_y
-    zx = (x // rect_x).astype(int)
-    zy = (y // rect_y).astype(int)
-    valid = (zx < zones_x) & (zy < zones_y)
-    counts = np.zeros((zones_y, zones_x))
-    np.add.at(counts, (zy[valid], zx[valid]), 1)
-    return counts
+    zones_y, zones_x = counts.shape
+    xs = np.linspace(0, pitch_w, zones_x + 1)
+    ys = np.linspace(0, pitch_h, zones_y + 1)
+    if origin == "upper":
+        ys = ys[::-1]
+
+    max_count = counts.max()
+    alphas = counts / max_count if max_count > 0 else np.zeros_like(counts)
+    facecolors = np.tile(mcolors.to_rgba(color), (counts.size, 1))
+    facecolors[:, 3] = alphas.ravel()
+
+    mesh = ax.pcolormesh(xs, ys, np.zeros(counts.shape), zorder=zorder)
+    mesh.set_array(None)
+    mesh.set_facecolor(facecolors)
+    if edgecolor is not None:
+        edgecolors = np.tile(mcolors.to_rgba(edgecolor), (counts.size, 1))
+        edgecolors[:, 3] = alphas.ravel()
+        mesh.set_edgecolor(edgecolors)
+        mesh.set_linewidth(linewidth)
+
+    if labels is not None:
+        label_kwargs = {
+            "ha": "center",
+            "va": "center",
+            "zorder": zorder + 1,
+            **(label_kwargs or {}),
+        }
+        centers_x = (xs[:-1] + xs[1:]) / 2
+        centers_y = (ys[:-1] + ys[1:]) / 2
+        rows, cols = np.nonzero(labels != "")
+        ax.add_artist(
+            ZoneLabels(
+                centers_x[cols], centers_y[rows], labels[rows, cols], **label_kwargs
+            )
+        )
+
+    return mesh
 
 
 def make_matplotlib_grid(n_items, max_cols=5, subplot_width=4, ratio=80 / 120):
@@ -0,0 +1,225 @@
+import matplotlib.patheffects as pe
+import matplotlib.pyplot as plt
+import numpy as np
+
+from .commons import saveFigure
+from .config import FIG_BACKGROUND_COLOR
+from .fullPitch import FullPitch
+
+
+HOME_TEAM_COLOR = "#3f8ae6"
+AWAY_TEAM_COLOR = "#f04a5f"
+
+
+def shotsWithFreezeFrame(match):
+    """
+    Returns the shots of a match (penalty shootouts excluded) that have a
+    freeze frame, with a fresh index.
+    """
+    df = match.events
+    is_shot = df["type_name"] == "Shot"
+    is_valid_period = df["period_id"] < 5
+    has_freeze = df["extra"].apply(
+        lambda x: isinstance(x, dict)
+        and "shot" in x
+        and "freeze_frame" in x.get("shot", {})
+    )
+    return df[is_shot & is_valid_period & has_freeze].reset_index(drop=True)
+
+
+def renderShotFreezeFrames(
+    match, folder, renderer=None, colors=(HOME_TEAM_COLOR, AWAY_TEAM_COLOR)
+):
+    """
+    Saves one freeze-frame image per shot of a match to folder.
+
+    Parameters:
+    - match: The Match to render.
+    - folder: Output folder, images are named shotFreezed_<i>.png.
+    - renderer: FreezeFrameRenderer to reuse (default: a new one, closed
+      when done).
+    - colors: (home team color, away team color).
+
+    Returns:
+    - paths: The paths of the saved images.
+    """
+    own_renderer = renderer is None
+    if own_renderer:
+        renderer = FreezeFrameRenderer()
+
+    player_to_jersey_map = dict(
+        zip(match.players["player_name"], match.players["jersey_number"])
+    )
+    paths = []
+    for i, shot in shotsWithFreezeFrame(match).iterrows():
+        x = shot.location[0]
+        y = 80 - shot.location[1]
+        shot_extra = shot["extra"]["shot"]
+        shot_end_x = shot_extra["end_location"][0]
+        shot_end_y = 80 - shot_extra["end_location"][1]
+        shot_frame = shot_extra["freeze_frame"]
+        shot_outcome = shot_extra["outcome"]["name"].lower()
+        shot_xg = shot_extra["statsbomb_xg"]
+
+        is_home = shot.team_id == match.homeTeamId
+        home_color = colors[0] if is_home else colors[1]
+        away_color = colors[1] if is_home else colors[0]
+
+        formatted_time = f"{shot.minute}:{shot.second:02d}"
+        renderer.render(
+            location=(x, y),
+            end_location=(shot_end_x, shot_end_y),
+            players_xy=[
+                (player["location"][0], 80 - player["location"][1])
+                for player in shot_frame
+            ],
+            teammate=[player["teammate"] for player in shot_frame],
+            jerseys=[
+                player_to_jersey_map.get(player["player"]["name"], "?")
+                for player in shot_frame
+            ],
+            colors=(home_color, away_color),
+            note=f"At {formatted_time}, {shot.player_name} took a shot with an xG of {round(shot_xg, 3)}, which resulted in {shot_outcome}.",
+        )
+        path = f"{folder}/shotFreezed_{i}.png"
+        saveFigure(renderer.fig, path)
+        paths.append(path)
+
+    if own_renderer:
+        renderer.close()
+    return paths
+
+
+class FreezeFrameRenderer:
+    """
+    Reusable figure for shot freeze frames.
+
+    The figure, pitch, legend and every artist are created once; each call
+    to render() only moves the shot marker, trajectory, player markers and
+    jersey labels and rewrites the note, so rendering many shots costs one
+    redraw per shot instead of a full matplotlib setup.
+    """
+
+    def __init__(self, figsize=(15, 15 * (80 / 120)), dpi=300):
+        self.pitch = FullPitch()
+        self.fig, self.ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
+        self.pitch.draw(self.ax)
+        self.fig.patch.set_facecolor(FIG_BACKGROUND_COLOR)
+        self.ax.set_facecolor(FIG_BACKGROUND_COLOR)
+
+        self.shot = self.ax.scatter(
+            [],
+            [],
+            s=120,
+            edgecolor="black",
+            linewidth=0.6,
+            zorder=11,
+            marker="*",
+        )
+        (self.trajectory,) = self.ax.plot(
+            [],
+            [],
+            color=(0, 0, 0, 0.2),
+            linewidth=0.9,
+            zorder=5,
+            linestyle="--",
+        )
+        self.players = self.ax.scatter(
+            [],
+            [],
+            s=120,
+            edgecolor="black",
+            linewidth=0.6,
+            zorder=9,
+            marker="o",
+        )
+        # Jersey labels, grown on demand and hidden when unused
+        self.labels = []
+
+        legend_elements = [
+            self.ax.scatter(
+                [],
+                [],
+                s=s,
+                edgecolor="black",
+                linewidth=0.6,
+                zorder=5,
+                marker=marker,
+                label=label,
+            )
+            for s, marker, label in (
+                (90, "*", "Shot location"),
+                (60, "o", "Teammate"),
+                (60, "o", "Opponent"),
+            )
+        ]
+        self.legend_handles = self.pitch.addPitchLegend(
+            self.ax, legend_elements
+        ).legend_handles
+        (self.note,) = self.pitch.addPitchNotes(self.ax, extra_text=[""])
+
+    def _label(self, i):
+        while len(self.labels) <= i:
+            self.labels.append(
+                self.ax.text(
+                    0,
+                    0,
+                    "",
+                    fontsize=6,
+                    zorder=9,
+                    ha="center",
+                    va="center",
+                    color="white",
+                    path_effects=[pe.withStroke(linewidth=1.5, foreground="black")],
+                )
+            )
+        return self.labels[i]
+
+    def render(
+        self, location, end_location, players_xy, teammate, jerseys, colors, note
+    ):
+        """
+        Updates the figure to show one shot.
+
+        Parameters
+        ----------
+        location, end_location : tuple
+            (x, y) start and end of the shot, in plot coordinates.
+        players_xy : np.ndarray
+            (n_players, 2) positions of the freeze frame players.
+        teammate : np.ndarray
+            Boolean mask of the shooter's teammates.
+        jerseys : list
+            Jersey label of every player.
+        colors : tuple
+            (shooting team color, opponent color).
+        note : str
+            Text shown below the pitch.
+        """
+        home_color, away_color = colors
+        players_xy = np.asarray(players_xy, dtype=float).reshape(-1, 2)
+
+        self.shot.set_offsets([location])
+        self.shot.set_facecolor(home_color)
+        self.trajectory.set_data(
+            [location[0], end_location[0]], [location[1], end_location[1]]
+        )
+        self.players.set_offsets(players_xy)
+        self.players.set_facecolor(np.where(teammate, home_color, away_color))
+
+        for i, ((x, y), jersey) in enumerate(zip(players_xy, jerseys)):
+            label = self._label(i)
+            label.set_position((x + 0.025, y - 0.05))
+            label.set_text(str(jersey))
+            label.set_visible(True)
+        for label in self.labels[len(players_xy) :]:
+            label.set_visible(False)
+
+        for handle, color in zip(
+            self.legend_handles, (home_color, home_color, away_color)
+        ):
+            handle.set_facecolor(color)
+        self.note.set_text(note)
+
+    def close(self):
+        plt.close(self.fig)
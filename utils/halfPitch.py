@@ -2,8 +2,12 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np
 
+from .pitchRendering import drawMarkings
+
 
 class HalfPitch:
+    _geometry = None
+
     def __init__(self):
         self.height = float(80)  # Updated height
         self.width = float(120)  # Updated width
@@ -19,9 +23,16 @@ class HalfPitch:
         """Convert a point's coordinates from meters to a 0-1 range."""
         return np.array([p[0] / self.width, p[1] / self.height])
 
-    def _draw_pitch_elements(self, ax, lines_color):
+    def _pitch_geometry(self):
+        """
+        Returns the pitch markings as a (n_lines, 2, 2) array of straight
+        segments and a list of (patch, alpha) arcs and spots, built once per
+        class and shared by every drawn pitch.
+        """
+        if type(self)._geometry is not None:
+            return type(self)._geometry
 
-        # Plot outer lines
+        # Outer lines
         outer_line_pts = [
             [self._point_to_meters([0, 0]), self._point_to_meters([0, 1])],  # Left line
             [
@@ -38,17 +49,6 @@ class HalfPitch:
             ],  # Bottom line
         ]
 
-        for line_pt in outer_line_pts:
-            ax.plot(
-                [line_pt[0][0], line_pt[1][0]],
-                [line_pt[0][1], line_pt[1][1]],
-                "-",
-                alpha=0.8,
-                lw=1.5,
-                zorder=3,
-                color=self.lines_color,
-            )
-
         line_pts = [
             # Center line
             [self._point_to_meters([0.5, 0]), self._point_to_meters([0.5, 1])],
@@ -78,77 +78,56 @@ class HalfPitch:
             [[120.1, 36], [120.1, 44]],
         ]
 
-        for line_pt in line_pts:
-            ax.plot(
-                [line_pt[0][0], line_pt[1][0]],
-                [line_pt[0][1], line_pt[1][1]],
-                "-",
-                alpha=0.8,
-                lw=1.5,
-                zorder=3,
-                color=lines_color,
-            )
-
-        # Left penalty arc
-        ax.add_patch(
-            patches.Wedge(
-                (11.0, 40),  # Center of the arc
-                10,  # Radius
-                308,
-                52,
-                fill=True,
-                edgecolor=lines_color,
-                facecolor=lines_color,
-                zorder=4,
-                width=0.02,
-                alpha=0.8,
-            )
-        )
-
-        # Right penalty arc
-        ax.add_patch(
-            patches.Wedge(
-                (109.0, 40),  # Center of the arc
-                10,  # Radius
-                128,
-                232,
-                fill=True,
-                edgecolor=lines_color,
-                facecolor=lines_color,
-                zorder=4,
-                width=0.02,
-                alpha=0.8,
-            )
-        )
+        markings = [
+            # Left penalty arc
+            (
+                patches.Wedge(
+                    (11.0, 40),  # Center of the arc
+                    10,  # Radius
+                    308,
+                    52,
+                    width=0.02,
+                ),
+                0.8,
+            ),
+            # Right penalty arc
+            (
+                patches.Wedge(
+                    (109.0, 40),  # Center of the arc
+                    10,  # Radius
+                    128,
+                    232,
+                    width=0.02,
+                ),
+                0.8,
+            ),
+            # Center circle
+            (
+                patches.Wedge(
+                    (60, 40),  # Middle of the pitch
+                    10,  # Radius of the center circle
+                    -90,
+                    90,
+                    width=0.02,
+                ),
+                0.8,
+            ),
+            # Center dot
+            (
+                patches.Circle(
+                    (60, 40),  # Middle of the pitch
+                    0.5,  # Radius of the center circle
+                ),
+                1,
+            ),
+        ]
 
-        # Center circle
-        ax.add_patch(
-            patches.Wedge(
-                (60, 40),  # Middle of the pitch
-                10,  # Radius of the center circle
-                -90,
-                90,
-                fill=True,
-                edgecolor=lines_color,
-                facecolor=lines_color,
-                zorder=4,
-                width=0.02,
-                alpha=0.8,
-            )
-        )
+        type(self)._geometry = (np.array(outer_line_pts + line_pts), markings)
+        return type(self)._geometry
 
-        # Center dot
-        ax.add_patch(
-            patches.Circle(
-                (60, 40),  # Middle of the pitch
-                0.5,  # Radius of the center circle
-                fill=True,
-                edgecolor=lines_color,
-                facecolor=lines_color,
-                zorder=4,
-                alpha=1,
-            )
-        )
+    def _draw_pitch_elements(self, ax, lines_color):
+        segments, markings = self._pitch_geometry()
+        drawMarkings(ax, segments, markings, lines_color)
 
     def draw(self):
         """
@@ -192,9 +171,9 @@ class HalfPitch:
 
     def addPitchLegend(self, ax, legendElements):
         """
-        Adds legend at the top of the plot
+        Adds legend at the top of the plot, returning the Legend.
         """
-        ax.legend(
+        return ax.legend(
             handles=legendElements,
             loc="upper center",
             ncol=len(legendElements),
@@ -7,8 +7,16 @@ Based on Socceraction Statsbomb loader
 """
 
 from statsbombpy import sb
+from requests.exceptions import HTTPError
+import os
+import tempfile
+import time
+import numpy as np
 import pandas as pd
 
+METADATA_CACHE_DIR = "metadata_cache"
+METADATA_TTL = 12 * 60 * 60  # seconds
+
 
 class Loader:
     def __init__(
@@ -109,12 +117,19 @@ class Loader:
         return obj
 
     def teams(self, game_id: int):
+        return self._teams_from(self._lineups(game_id))
+
+    def _teams_from(self, lineups):
         cols = ["team_id", "team_name"]
-        obj = self._lineups(game_id)
 
-        return pd.DataFrame(obj)[cols]
+        return pd.DataFrame(lineups)[cols]
 
     def players(self, game_id: int):
+        return self._players_from(
+            game_id, self._lineups(game_id), self.events(game_id)
+        )
+
+    def _players_from(self, game_id: int, lineups, events):
 
         cols = [
             "game_id",
@@ -129,12 +144,10 @@ class Loader:
             "minutes_played",
         ]
 
-        obj = self._lineups(game_id)
-
         playersdf = pd.DataFrame(
-            self._flatten_id(p) for lineup in obj for p in lineup["lineup"]
+            self._flatten_id(p) for lineup in lineups for p in lineup["lineup"]
         )
-        playergamesdf = self.extract_player_games(self.events(game_id))
+        playergamesdf = self.extract_player_games(events)
 
         playersdf = pd.merge(
             playersdf,
@@ -166,6 +179,48 @@ class Loader:
         return playersdf[cols]
 
     def events(self, game_id: int, load_360: bool = False):
+        eventsdf = self._events_from(game_id, self._events(game_id))
+        if not load_360 or eventsdf.empty:
+            return eventsdf
+
+        return self._merge_frames(eventsdf, self.frames(game_id))
+
+    def match_bundle(self, game_id: int, load_360: bool = False):
+        """
+        Fetches events, lineups and (optionally) 360 frames of a game exactly
+        once and derives the events, teams and players frames from them.
+
+        The 360 frames are returned as the raw statsbombpy payload, separately
+        from the events. They are None if load_360 is False or if they are not
+        available for the game (HTTP error).
+
+        Returns a tuple (events, teams, players, frames).
+        """
+        eventsdf = self._events_from(game_id, self._events(game_id))
+        lineups = self._lineups(game_id)
+
+        teamsdf = self._teams_from(lineups)
+        playersdf = self._players_from(game_id, lineups, eventsdf)
+
+        frames = None
+        if load_360:
+            try:
+                frames = self.frames(game_id)
+            except HTTPError:
+                pass
+
+        return eventsdf, teamsdf, playersdf, frames
+
+    def _events(self, game_id: int):
+
+        obj = list(sb.events(game_id, fmt="dict", creds=self._creds).values())
+
+        if not isinstance(obj, list):
+            raise ValueError("The retrieved data should contain a list of events")
+
+        return obj
+
+    def _events_from(self, game_id: int, obj):
 
         cols = [
             "game_id",
@@ -196,37 +251,145 @@ class Loader:
             "counterpress",
         ]
 
-        # Load the events
-        obj = list(sb.events(game_id, fmt="dict", creds=self._creds).values())
-
-        if not isinstance(obj, list):
-            raise ValueError("The retrieved data should contain a list of events")
         if len(obj) == 0:
             return pd.DataFrame(columns=cols)
 
-        eventsdf = pd.DataFrame(self._flatten_id(e) for e in obj)
-        eventsdf["match_id"] = game_id
-        eventsdf["timestamp"] = pd.to_timedelta(eventsdf["timestamp"])
-        eventsdf["related_events"] = eventsdf["related_events"].apply(
-            lambda d: d if isinstance(d, list) else []
-        )
-        eventsdf["under_pressure"] = (
-            eventsdf["under_pressure"].fillna(False).astype(bool)
-        )
-        eventsdf["counterpress"] = eventsdf["counterpress"].fillna(False).astype(bool)
-        eventsdf.rename(
-            columns={"id": "event_id", "period": "period_id", "match_id": "game_id"},
-            inplace=True,
-        )
-        if not load_360:
-            return eventsdf[cols]
+        # Build the columns straight from the raw events, with the same
+        # semantics as _flatten_id: dicts with an id and a name become
+        # <key>_id / <key>_name columns, any other dict goes to extra
+        nan = np.nan
+        scalars = [
+            "id",
+            "period",
+            "index",
+            "minute",
+            "second",
+            "possession",
+            "duration",
+            "location",
+        ]
+        named = [
+            "team",
+            "player",
+            "type",
+            "possession_team",
+            "play_pattern",
+            "position",
+        ]
+        values = {key: [e.get(key, nan) for e in obj] for key in scalars}
+        ids, names = {}, {}
+        for key in named:
+            dicts = [e.get(key) for e in obj]
+            ids[key] = self._number_column([d["id"] if d else nan for d in dicts])
+            names[key] = self._object_column([d["name"] if d else nan for d in dicts])
+        related_events = [
+            r if isinstance(r, list) else []
+            for r in (e.get("related_events") for e in obj)
+        ]
+        # only keys that are never flat scalars can hold nested dicts
+        not_nested = set(scalars) | {
+            "timestamp",
+            "related_events",
+            "under_pressure",
+            "counterpress",
+        }
+        extras = [
+            {
+                k: v
+                for k, v in e.items()
+                if k not in not_nested
+                and isinstance(v, dict)
+                and not ("id" in v and "name" in v)
+            }
+            for e in obj
+        ]
+
+        return pd.DataFrame(
+            {
+                "game_id": game_id,
+                "event_id": self._object_column(values["id"]),
+                "period_id": self._number_column(values["period"]),
+                "team_id": ids["team"],
+                "player_id": ids["player"],
+                "type_id": ids["type"],
+                "type_name": names["type"],
+                "index": self._number_column(values["index"]),
+                "timestamp": self._parse_timestamps([e["timestamp"] for e in obj]),
+                "minute": self._number_column(values["minute"]),
+                "second": self._number_column(values["second"]),
+                "possession": self._number_column(values["possession"]),
+                "possession_team_id": ids["possession_team"],
+                "possession_team_name": names["possession_team"],
+                "play_pattern_id": ids["play_pattern"],
+                "play_pattern_name": names["play_pattern"],
+                "team_name": names["team"],
+                "duration": np.array(values["duration"], dtype=float),
+                "extra": self._object_column(extras),
+                "related_events": self._object_column(related_events),
+                "player_name": names["player"],
+                "position_id": ids["position"],
+                "position_name": names["position"],
+                "location": self._object_column(values["location"]),
+                "under_pressure": np.array(
+                    [bool(e.get("under_pressure", False)) for e in obj], dtype=bool
+                ),
+                "counterpress": np.array(
+                    [bool(e.get("counterpress", False)) for e in obj], dtype=bool
+                ),
+            }
+        )[cols]
+
+    def _number_column(self, values):
+        """Integer array, or float when some values are missing (as pandas infers)."""
+        arr = np.array(values, dtype=float)
+        return arr if np.isnan(arr).any() else arr.astype(np.int64)
+
+    def _object_column(self, values):
+        # np.fromiter keeps lists and dicts as single elements
+        return np.fromiter(values, dtype=object, count=len(values))
+
+    def _parse_timestamps(self, timestamps):
+        """
+        Parses StatsBomb "HH:MM:SS.fff" timestamps into timedeltas by reading
+        the digits straight from a fixed-width byte buffer, which is much
+        faster than pd.to_timedelta on strings. Any other format falls back
+        to pd.to_timedelta.
+        """
+
+        raw = np.asarray(timestamps, dtype=str)
+        if raw.dtype.itemsize != 12 * 4 or (np.char.str_len(raw) != 12).any():
+            return pd.to_timedelta(timestamps).to_numpy()
+
+        digits = raw.astype("S12").view(np.uint8).reshape(-1, 12).astype(np.int64) - 48
+        is_digit = (digits >= 0) & (digits <= 9)
+        has_separators = (digits[:, [2, 5]] == ord(":") - 48).all() and (
+            digits[:, 8] == ord(".") - 48
+        ).all()
+        if not (has_separators and is_digit[:, [0, 1, 3, 4, 6, 7, 9, 10, 11]].all()):
+            return pd.to_timedelta(timestamps).to_numpy()
+
+        hours = digits[:, 0] * 10 + digits[:, 1]
+        minutes = digits[:, 3] * 10 + digits[:, 4]
+        seconds = digits[:, 6] * 10 + digits[:, 7]
+        millis = digits[:, 9] * 100 + digits[:, 10] * 10 + digits[:, 11]
+        total_ms = ((hours * 60 + minutes) * 60 + seconds) * 1000 + millis
+
+        return (total_ms * 1_000_000).astype("timedelta64[ns]")
+
+    def frames(self, game_id: int):
 
-        # Load the 360 data
-        cols_360 = ["visible_area_360", "freeze_frame_360"]
         obj = sb.frames(game_id, fmt="dict", creds=self._creds)
 
         if not isinstance(obj, list):
             raise ValueError("The retrieved data should contain a list of frames")
+
+        return obj
+
+    def _merge_frames(self, eventsdf, obj):
+
+        cols = list(eventsdf.columns)
+        cols_360 = ["visible_area_360", "freeze_frame_360"]
+
         if len(obj) == 0:
             eventsdf["visible_area_360"] = None
             eventsdf["freeze_frame_360"] = None
@@ -244,87 +407,88 @@ class Loader:
 
     def extract_player_games(self, events):
 
+        type_name = events["type_name"].to_numpy()
+        period_id = events["period_id"].to_numpy()
+        minute = events["minute"].to_numpy()
+        player_id = events["player_id"].to_numpy()
+        team_id = events["team_id"].to_numpy()
+        team_name = events["team_name"].to_numpy()
+        extra = events["extra"].to_numpy()
+
         # get duration of each period
-        periods = pd.DataFrame(
-            [
-                {"period_id": 1, "minute": 45},
-                {"period_id": 2, "minute": 45},
-                {"period_id": 3, "minute": 15},
-                {"period_id": 4, "minute": 15},
-                # Shoot-outs should not contritbute to minutes played
-                # {"period_id": 5, "minute": 0},
-            ]
-        ).set_index("period_id")
-        periods_minutes = (
-            events.loc[events.type_name == "Half End", ["period_id", "minute"]]
-            .drop_duplicates()
-            .set_index("period_id")
-            .sort_index()
-            .subtract(periods.cumsum().shift(1).fillna(0))
-            .minute.dropna()
-            .astype(int)
-            .tolist()
+        # Shoot-outs (period 5) should not contribute to minutes played
+        period_starts = {1: 0, 2: 45, 3: 90, 4: 105}
+        is_half_end = type_name == "Half End"
+        half_ends = np.unique(
+            np.column_stack([period_id[is_half_end], minute[is_half_end]]).astype(int),
+            axis=0,
         )
+        periods_minutes = [
+            int(m - period_starts[p]) for p, m in half_ends if p in period_starts
+        ]
         # get duration of entire match
         game_minutes = sum(periods_minutes)
 
         game_id = events.game_id.mode().values[0]
-        players = {}
-        # Red cards
-        red_cards = events[
-            events.apply(
-                lambda x: any(
-                    e in x.extra
-                    and "card" in x.extra[e]
-                    and x.extra[e]["card"]["name"] in ["Second Yellow", "Red Card"]
-                    for e in ["foul_committed", "bad_behaviour"]
-                ),
-                axis=1,
-            )
+        # Red cards: minute of the first red card of every player
+        red_card_minutes = {}
+        for i in np.flatnonzero(np.isin(type_name, ["Foul Committed", "Bad Behaviour"])):
+            if self._is_red_card(extra[i]):
+                red_card_minutes.setdefault(player_id[i], minute[i])
+
+        # starting XI and substitutes, in order of appearance
+        starters = [
+            {
+                **self._flatten_id(player),
+                **{
+                    "game_id": game_id,
+                    "team_id": team_id[i],
+                    "team_name": team_name[i],
+                },
+            }
+            for i in np.flatnonzero(type_name == "Starting XI")
+            for player in extra[i]["tactics"]["lineup"]
         ]
-        # stats for starting XI
-        for startxi in events[events.type_name == "Starting XI"].itertuples():
-            team_id, team_name = startxi.team_id, startxi.team_name
-            for player in startxi.extra["tactics"]["lineup"]:
-                player = self._flatten_id(player)
-                player = {
-                    **player,
-                    **{
-                        "game_id": game_id,
-                        "team_id": team_id,
-                        "team_name": team_name,
-                        "minutes_played": game_minutes,
-                    },
-                }
-                player_red_card = red_cards[red_cards.player_id == player["player_id"]]
-                if len(player_red_card) > 0:
-                    red_card_minute = player_red_card.iloc[0].minute
-                    player["minutes_played"] = self._expand_minute(
-                        red_card_minute, periods_minutes
-                    )
-                players[player["player_id"]] = player
-        # stats for substitutions
-        for substitution in events[events.type_name == "Substitution"].itertuples():
-            exp_sub_minute = self._expand_minute(substitution.minute, periods_minutes)
-            replacement = {
-                "player_id": substitution.extra["substitution"]["replacement"]["id"],
-                "player_name": substitution.extra["substitution"]["replacement"][
-                    "name"
-                ],
-                "minutes_played": game_minutes - exp_sub_minute,
-                "team_id": substitution.team_id,
+        substitutions = np.flatnonzero(type_name == "Substitution")
+        replacements = [
+            {
+                "player_id": extra[i]["substitution"]["replacement"]["id"],
+                "player_name": extra[i]["substitution"]["replacement"]["name"],
+                "team_id": team_id[i],
                 "game_id": game_id,
-                "team_name": substitution.team_name,
+                "team_name": team_name[i],
             }
-            player_red_card = red_cards[red_cards.player_id == replacement["player_id"]]
-            if len(player_red_card) > 0:
-                red_card_minute = player_red_card.iloc[0].minute
-                replacement["minutes_played"] = (
-                    self._expand_minute(red_card_minute, periods_minutes)
-                    - exp_sub_minute
-                )
-            players[replacement["player_id"]] = replacement
-            players[substitution.player_id]["minutes_played"] = exp_sub_minute
+            for i in substitutions
+        ]
+        exp_sub_minutes = self._expand_minutes(minute[substitutions], periods_minutes)
+
+        # minutes played: from entering the pitch until the end of the game or
+        # the player's red card
+        red_card_minute = (
+            pd.Series([p["player_id"] for p in starters + replacements], dtype=float)
+            .map(red_card_minutes)
+            .to_numpy(dtype=float)
+        )
+        is_sent_off = ~np.isnan(red_card_minute)
+        exp_red_card_minutes = self._expand_minutes(
+            np.nan_to_num(red_card_minute).astype(int), periods_minutes
+        )
+        entered_minutes = np.concatenate(
+            [np.zeros(len(starters), dtype=int), exp_sub_minutes]
+        )
+        minutes_played = (
+            np.where(is_sent_off, exp_red_card_minutes, game_minutes) - entered_minutes
+        )
+
+        players = {}
+        for player, minutes in zip(starters + replacements, minutes_played):
+            players[player["player_id"]] = {**player, "minutes_played": minutes}
+        # substituted players leave the pitch at the substitution minute
+        for sub_player_id, exp_sub_minute in zip(
+            player_id[substitutions], exp_sub_minutes
+        ):
+            players[sub_player_id]["minutes_played"] = exp_sub_minute
+
         pg = pd.DataFrame(players.values()).fillna(0)
         for col in pg.columns:
             if "_id" in col:
@@ -332,6 +496,14 @@ class Loader:
 
         return pg
 
+    def _is_red_card(self, extra):
+        return any(
+            e in extra
+            and "card" in extra[e]
+            and extra[e]["card"]["name"] in ["Second Yellow", "Red Card"]
+            for e in ["foul_committed", "bad_behaviour"]
+        )
+
     def _flatten_id(self, d):
         newd = {}
         extra = {}
@@ -374,3 +546,89 @@ class Loader:
             else:
                 break
         return expanded_minute
+
+    def _expand_minutes(self, minutes, periods_duration):
+        """Vectorized _expand_minute over an array of minutes."""
+
+        periods_regular = np.array([45, 45, 15, 15, 0])
+        n_periods = max(len(periods_duration) - 1, 0)
+        added_time = np.asarray(periods_duration[:n_periods], dtype=int) - (
+            periods_regular[:n_periods]
+        )
+        # minutes only ever move forward, so every regular period boundary
+        # passed contributes the added time of that period
+        is_past = minutes[:, None] > np.cumsum(periods_regular)[:n_periods]
+        return minutes + is_past.astype(int) @ added_time
+
+
+class MetadataCache:
+    """
+    Memoized, persistent cache of the competitions and games listings.
+
+    Listings are memoized in-process (shared by every instance) and persisted
+    to disk, and both copies expire after `ttl` seconds so new fixtures still
+    show up. Each season's games are indexed once, so season and team lookups
+    are answered locally without touching the games frame again.
+    """
+
+    _memo = {}
+    _indexes = {}
+
+    def __init__(self, loader=None, cache_dir=METADATA_CACHE_DIR, ttl=METADATA_TTL):
+        self._loader = loader or Loader()
+        self._cache_dir = cache_dir
+        self._ttl = ttl
+
+    def _get(self, key, fetch):
+        now = time.time()
+        entry = self._memo.get(key)
+        if entry is not None and now - entry[0] < self._ttl:
+            return entry[1]
+
+        path = os.path.join(self._cache_dir, f"{key}.pkl")
+        if os.path.exists(path) and now - os.path.getmtime(path) < self._ttl:
+            fetched_at, value = os.path.getmtime(path), pd.read_pickle(path)
+        else:
+            fetched_at, value = now, fetch()
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            os.close(fd)
+            value.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+
+        self._memo[key] = (fetched_at, value)
+        return value
+
+    def competitions(self):
+        return self._get("competitions", self._loader.competitions)
+
+    def games(self, competition_id: int, season_id: int):
+        return self._get(
+            f"games_{competition_id}_{season_id}",
+            lambda: self._loader.games(competition_id, season_id),
+        )
+
+    def season_index(self, competition_id: int, season_id: int):
+        """
+        Returns a dict with the season's game ids ("games"), its teams
+        ("teams") and the game ids of every team ("team_games"). The index is
+        rebuilt only when the underlying games listing is refreshed.
+        """
+        games = self.games(competition_id, season_id)
+        key = (competition_id, season_id)
+        cached = self._indexes.get(key)
+        if cached is not None and cached[0] is games:
+            return cached[1]
+
+        team_games = {}
+        for game in games.itertuples():
+            for team in (game.home_team_name, game.away_team_name):
+                team_games.setdefault(team, []).append(game.game_id)
+
+        index = {
+            "games": list(games["game_id"]),
+            "teams": list(games["home_team_name"].unique()),
+            "team_games": team_games,
+        }
+        self._indexes[key] = (games, index)
+        return index
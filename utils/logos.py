@@ -0,0 +1,105 @@
+import hashlib
+import io
+import os
+import tempfile
+import urllib.request
+
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageEnhance
+
+from .config import TEAM_LOGO_URL
+
+LOGO_CACHE_DIR = "logo_cache"
+
+# Pre-converted variants kept for every logo: name -> conversion of the RGBA logo
+VARIANTS = {
+    "RGBA": lambda img: img,
+    "LA": lambda img: img.convert("LA"),
+    "desaturated": lambda img: ImageEnhance.Color(img).enhance(0.5),
+}
+
+
+class LogoCache:
+    """
+    Persistent cache of the team logos listed in config.TEAM_LOGO_URL.
+
+    Every logo is downloaded once and stored on disk in each of the VARIANTS,
+    and variants are memoized in-process (shared by every instance), so
+    figures render without network access once a logo has been fetched.
+    """
+
+    _memo = {}
+
+    def __init__(self, cache_dir=LOGO_CACHE_DIR, urls=TEAM_LOGO_URL, workers=8):
+        self._cache_dir = cache_dir
+        self._urls = urls
+        self._workers = workers
+
+    def _path(self, url, variant):
+        key = hashlib.sha1(url.encode()).hexdigest()[:16]
+        return os.path.join(self._cache_dir, f"{key}_{variant}.png")
+
+    def _is_cached(self, url):
+        return all(os.path.exists(self._path(url, variant)) for variant in VARIANTS)
+
+    def _download(self, url):
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                img = Image.open(io.BytesIO(response.read())).convert("RGBA")
+        except OSError:
+            # Offline or missing logo
+            return
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        for variant, convert in VARIANTS.items():
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                convert(img).save(f, format="PNG")
+            os.replace(tmp_path, self._path(url, variant))
+
+    def prefetch(self, teams=None):
+        """
+        Downloads the logos of the given teams (default: all) that are not
+        cached yet, in parallel.
+
+        Returns:
+        - missing: The teams whose logo is still unavailable.
+        """
+        teams = list(self._urls) if teams is None else list(teams)
+        urls = {self._urls[team] for team in teams if team in self._urls}
+        misses = [url for url in urls if not self._is_cached(url)]
+        if misses:
+            with ThreadPoolExecutor(max_workers=self._workers) as pool:
+                list(pool.map(self._download, misses))
+
+        return [
+            team
+            for team in teams
+            if team not in self._urls or not self._is_cached(self._urls[team])
+        ]
+
+    def get(self, team, variant="RGBA"):
+        """
+        Returns the team logo as a PIL image in the given variant ("RGBA",
+        "LA" or "desaturated"), downloading it if needed, or None if it is not
+        available.
+        """
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown logo variant: {variant}")
+
+        url = self._urls.get(team)
+        if url is None:
+            return None
+
+        key = (url, variant)
+        if key not in self._memo:
+            if not self._is_cached(url):
+                self._download(url)
+            path = self._path(url, variant)
+            if not os.path.exists(path):
+                return None
+            with Image.open(path) as img:
+                img.load()
+                self._memo[key] = img
+
+        return self._memo[key]
@@ -0,0 +1,568 @@
+"""
+
+Based on Sergio Llana (@SergioMinuto90) passing network created on Sun Apr 19 2020
+
+"""
+
+import matplotlib.patheffects as pe
+import matplotlib.pyplot as plt
+import matplotlib.lines as mlines
+import numpy as np
+import pandas as pd
+
+from .fullPitch import FullPitch
+from .commons import getMetadataCache, loadEvents, saveFigure
+from .config import FIG_BACKGROUND_COLOR, PITCH_RATIO
+from .plotting import edgeLayer, scatterLayer
+
+
+# Match minute at which each period starts (index: period_id), and its length
+PERIOD_START_MINUTE = np.array([0, 0, 45, 90, 105, 120])
+PERIOD_LENGTH_MINUTES = np.array([0, 45, 45, 15, 15, 0])
+# Span of one period on the matchClock, longer than any period with stoppages
+PERIOD_SECONDS = 3600
+
+# Event columns read by the network builders
+NETWORK_COLUMNS = [
+    "game_id",
+    "team_id",
+    "index",
+    "type_name",
+    "player_id",
+    "player_name",
+    "pass_recipient_id",
+    "pass_recipient_name",
+    "location_x",
+    "location_y",
+    "pass_success",
+]
+
+
+def passesBeforeFirstSubstitution(events):
+    """
+    Keeps the successful passes of every team made before that team's first
+    substitution, for any number of games at once. Teams that made no
+    substitution keep all their successful passes.
+
+    Parameters:
+    - events: Events of one or more games, with at least the NETWORK_COLUMNS
+      (passes and substitutions are enough).
+
+    Returns:
+    - passes: The selected passes, in event order.
+    """
+    keys = ["game_id", "team_id"]
+    isSub = events["type_name"] == "Substitution"
+    firstSub = events[isSub].groupby(keys)["index"].min().rename("first_sub")
+    firstSub = events[keys].join(firstSub, on=keys)["first_sub"].fillna(np.inf)
+    isPass = events["type_name"] == "Pass"
+    keep = isPass & events["pass_success"].fillna(False).astype(bool)
+    keep &= events["index"] < firstSub
+    return events[keep].sort_values(keys + ["index"], kind="stable")
+
+
+class PassingNetwork:
+    """
+    Passing networks of many groups (e.g. every team of every game of a
+    season), built in one pass over their passes.
+
+    Players are factorized into per-group node codes 0 .. n_nodes - 1, so
+    node counts and average locations come from np.bincount and the
+    undirected adjacency of every group is one (n_groups, max_nodes,
+    max_nodes) array. Node y coordinates are flipped (80 - location_y) for
+    plotting on a FullPitch.
+
+    Attributes:
+    - keys: DataFrame of the group keys, one row per network.
+    - nodes: DataFrame with one row per (group, player): group, node,
+      player_id, player_name, num_passes (passes made), x, y (average pass
+      origin, NaN for players who only received).
+    - adjacency: Passes exchanged between every pair of nodes, in either
+      direction, per group.
+    """
+
+    def __init__(self, keys, nodes, adjacency):
+        self.keys = keys
+        self.nodes = nodes
+        self.adjacency = adjacency
+        self._groupIndex = {
+            key: g for g, key in enumerate(keys.itertuples(index=False, name=None))
+        }
+
+    @classmethod
+    def fromPasses(cls, passes, groupBy=("game_id", "team_id")):
+        """
+        Builds the networks of every group of passes.
+
+        Parameters:
+        - passes: Passes with player_id, player_name, pass_recipient_id,
+          pass_recipient_name, location_x, location_y and the groupBy
+          columns, e.g. from passesBeforeFirstSubstitution. Passes without a
+          recipient count for the passer but add no edge.
+        - groupBy: Columns identifying one network.
+
+        Returns:
+        - network: The PassingNetwork of every group, in sorted key order.
+        """
+        groupBy = list(groupBy)
+        group = passes.groupby(groupBy, sort=True).ngroup().to_numpy()
+        keys = passes[groupBy].drop_duplicates().sort_values(groupBy)
+        nGroups = len(keys)
+
+        # One code per player over passers and receivers, then one node per
+        # (group, player) numbered within its group
+        passerIds = passes["player_id"].to_numpy(dtype=float)
+        receiverIds = passes["pass_recipient_id"].to_numpy(dtype=float)
+        playerCodes, playerIds = pd.factorize(
+            np.concatenate([passerIds, receiverIds])
+        )
+        nPlayers = max(len(playerIds), 1)
+        passer, receiver = np.split(playerCodes, 2)
+        hasReceiver = receiver >= 0
+        srcGroup = group[hasReceiver]
+        pairs = np.concatenate(
+            [group * nPlayers + passer, srcGroup * nPlayers + receiver[hasReceiver]]
+        )
+        groupPlayers, inverse = np.unique(pairs, return_inverse=True)
+        nodeGroup = groupPlayers // nPlayers
+        groupStart = np.searchsorted(nodeGroup, np.arange(nGroups))
+        localNode = np.arange(len(groupPlayers)) - groupStart[nodeGroup]
+        maxNodes = int(localNode.max()) + 1 if len(localNode) else 0
+
+        n = len(passes)
+        src = localNode[inverse[:n]]
+        dst = localNode[inverse[n:]]
+        size = nGroups * maxNodes
+
+        flat = group * maxNodes + src
+        numPasses = np.bincount(flat, minlength=size)
+        x = passes["location_x"].to_numpy(dtype=float)
+        y = 80 - passes["location_y"].to_numpy(dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            meanX = np.bincount(flat, weights=x, minlength=size) / numPasses
+            meanY = np.bincount(flat, weights=y, minlength=size) / numPasses
+
+        lo = np.minimum(src[hasReceiver], dst)
+        hi = np.maximum(src[hasReceiver], dst)
+        upper = np.bincount(
+            (srcGroup * maxNodes + lo) * maxNodes + hi, minlength=size * maxNodes
+        ).reshape(nGroups, maxNodes, maxNodes)
+        adjacency = upper + upper.transpose(0, 2, 1)
+        diagonal = np.arange(maxNodes)
+        adjacency[:, diagonal, diagonal] = upper[:, diagonal, diagonal]
+
+        names = pd.concat(
+            [
+                pd.Series(
+                    passes["player_name"].to_numpy(dtype=object), index=passerIds
+                ),
+                pd.Series(
+                    passes["pass_recipient_name"].to_numpy(dtype=object),
+                    index=receiverIds,
+                ),
+            ]
+        )
+        names = names[~names.index.isna()]
+        names = names[~names.index.duplicated()]
+
+        nodeFlat = nodeGroup * maxNodes + localNode
+        nodeIds = playerIds[groupPlayers % nPlayers]
+        nodes = pd.DataFrame(
+            {
+                "group": nodeGroup,
+                "node": localNode,
+                "player_id": nodeIds,
+                "player_name": names.reindex(nodeIds).to_numpy(),
+                "num_passes": numPasses[nodeFlat],
+                "x": meanX[nodeFlat],
+                "y": meanY[nodeFlat],
+            }
+        )
+        return cls(keys.reset_index(drop=True), nodes, adjacency)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _group(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        try:
+            return self._groupIndex[key]
+        except KeyError:
+            raise KeyError(f"No passing network for {key}") from None
+
+    def groupNodes(self, key):
+        """Nodes of one network (key: tuple of the groupBy values)."""
+        return self.nodes[self.nodes["group"] == self._group(key)].reset_index(
+            drop=True
+        )
+
+    def groupEdges(self, key, minPasses=1):
+        """
+        Edges of one network with at least minPasses passes exchanged, as a
+        DataFrame of node_a <= node_b and num_passes.
+        """
+        adjacency = np.triu(self.adjacency[self._group(key)])
+        a, b = np.nonzero(adjacency >= minPasses)
+        return pd.DataFrame({"node_a": a, "node_b": b, "num_passes": adjacency[a, b]})
+
+
+def matchClock(period, minute, second):
+    """
+    Monotonic match clock, in seconds: the period's offset (PERIOD_SECONDS per
+    period) plus the seconds elapsed in the period.
+
+    StatsBomb minutes run on across periods, so first half stoppage time
+    (45:00, 46:00, ...) overlaps the start of the second half; minute * 60 +
+    second does not order events across periods, this clock does.
+
+    Parameters:
+    - period, minute, second: Scalars or arrays, as in the event table.
+
+    Returns:
+    - clock: Seconds on the match clock, as floats.
+    """
+    period = np.asarray(period, dtype=int)
+    elapsed = np.asarray(minute, dtype=float) * 60 + np.asarray(second, dtype=float)
+    return (period - 1) * PERIOD_SECONDS + elapsed - PERIOD_START_MINUTE[period] * 60
+
+
+def clockBoundaries(minutes=15, periods=(1, 2)):
+    """
+    matchClock window boundaries every given minutes of each period. The
+    last window of a period runs until the next period starts, so it holds
+    the stoppage time.
+    """
+    boundaries = []
+    for period in periods:
+        start = (period - 1) * PERIOD_SECONDS
+        length = PERIOD_LENGTH_MINUTES[period] * 60
+        boundaries.extend(start + np.arange(0, length, minutes * 60))
+    boundaries.append(periods[-1] * PERIOD_SECONDS)
+    return np.array(boundaries, dtype=float)
+
+
+class PassingNetworkTimeline:
+    """
+    Cumulative passing network of one team over a match, for networks of any
+    time window.
+
+    The passes are kept in event order (period, then index) and snapshot i
+    holds the passes made, pass origin sums and adjacency of the first i
+    passes (prefix sums), so the network of a window [t0, t1) is the
+    difference of two snapshots, with no pass read again. Windows are given
+    on the matchClock axis. Node y coordinates are flipped (80 - location_y)
+    as in PassingNetwork.
+
+    Attributes:
+    - nodes: DataFrame of the players (node order): player_id, player_name.
+    - times: matchClock of every pass, non-decreasing.
+    """
+
+    def __init__(self, nodes, times, passCounts, sumX, sumY, adjacency):
+        self.nodes = nodes
+        self.times = times
+        self._passCounts = passCounts
+        self._sumX = sumX
+        self._sumY = sumY
+        self._adjacency = adjacency
+
+    @classmethod
+    def fromPasses(cls, passes):
+        """
+        Builds the timeline of one team from its passes, e.g. the successful
+        passes of Match.table.
+
+        Parameters:
+        - passes: Passes with period_id, index, minute, second, player_id,
+          player_name, pass_recipient_id, pass_recipient_name, location_x and
+          location_y. Passes without a recipient count for the passer but add
+          no edge.
+
+        Returns:
+        - timeline: The PassingNetworkTimeline of the passes.
+        """
+        passes = passes.sort_values(["period_id", "index"], kind="stable")
+        # Guard searchsorted against clock jitter between consecutive events
+        times = np.maximum.accumulate(
+            matchClock(passes["period_id"], passes["minute"], passes["second"])
+        )
+
+        passerIds = passes["player_id"].to_numpy(dtype=float)
+        receiverIds = passes["pass_recipient_id"].to_numpy(dtype=float)
+        codes, playerIds = pd.factorize(np.concatenate([passerIds, receiverIds]))
+        passer, receiver = np.split(codes, 2)
+        nNodes = len(playerIds)
+        names = pd.Series(
+            np.concatenate(
+                [
+                    passes["player_name"].to_numpy(dtype=object),
+                    passes["pass_recipient_name"].to_numpy(dtype=object),
+                ]
+            )
+        )
+        nodes = pd.DataFrame(
+            {
+                "player_id": playerIds,
+                "player_name": names.groupby(codes).first().reindex(range(nNodes)),
+            }
+        )
+
+        # Row i + 1 holds the contribution of pass i, row 0 stays empty
+        n = len(passes)
+        rows = np.arange(1, n + 1)
+        passCounts = np.zeros((n + 1, nNodes), dtype=np.int32)
+        sumX = np.zeros((n + 1, nNodes))
+        sumY = np.zeros((n + 1, nNodes))
+        passCounts[rows, passer] = 1
+        sumX[rows, passer] = passes["location_x"].to_numpy(dtype=float)
+        sumY[rows, passer] = 80 - passes["location_y"].to_numpy(dtype=float)
+
+        hasReceiver = receiver >= 0
+        adjacency = np.zeros((n + 1, nNodes, nNodes), dtype=np.int32)
+        rows, src, dst = rows[hasReceiver], passer[hasReceiver], receiver[hasReceiver]
+        adjacency[rows, src, dst] = 1
+        adjacency[rows, dst, src] = 1
+
+        return cls(
+            nodes,
+            times,
+            np.cumsum(passCounts, axis=0),
+            np.cumsum(sumX, axis=0),
+            np.cumsum(sumY, axis=0),
+            np.cumsum(adjacency, axis=0),
+        )
+
+    @classmethod
+    def fromMatch(cls, match, teamId):
+        """Builds the timeline of the successful passes of a team in a match."""
+        frame = match.table.frame
+        isTeamPass = (frame["team_id"] == teamId) & frame["pass_success"]
+        return cls.fromPasses(frame[isTeamPass])
+
+    def _snapshot(self, t):
+        return np.searchsorted(self.times, t, side="left")
+
+    def window(self, t0, t1):
+        """
+        Passing network of the passes made in [t0, t1) (matchClock seconds).
+
+        Returns:
+        - nodes: The nodes DataFrame with num_passes, x and y (average pass
+          origin, NaN for players without passes in the window).
+        - adjacency: Passes exchanged between every pair of nodes.
+        """
+        i0, i1 = self._snapshot(t0), self._snapshot(t1)
+        numPasses = self._passCounts[i1] - self._passCounts[i0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x = (self._sumX[i1] - self._sumX[i0]) / numPasses
+            y = (self._sumY[i1] - self._sumY[i0]) / numPasses
+        nodes = self.nodes.assign(num_passes=numPasses, x=x, y=y)
+        return nodes, self._adjacency[i1] - self._adjacency[i0]
+
+    def windows(self, boundaries):
+        """
+        Passing networks between consecutive matchClock boundaries, e.g.
+        clockBoundaries(15) for every 15 minutes, or the kick-off, every
+        substitution time and the final whistle.
+
+        Returns:
+        - networks: A list of (t0, t1, nodes, adjacency), see window.
+        """
+        return [
+            (t0, t1) + self.window(t0, t1)
+            for t0, t1 in zip(boundaries[:-1], boundaries[1:])
+        ]
+
+
+def substitutionTimes(match, teamId):
+    """matchClock times of the substitutions of a team, in order."""
+    frame = match.table.frame
+    subs = frame[(frame["team_id"] == teamId) & (frame["type_name"] == "Substitution")]
+    return np.sort(matchClock(subs["period_id"], subs["minute"], subs["second"]))
+
+
+def seasonPassingNetworks(competitionId, seasonId):
+    """
+    Builds the passing network of every team in every game of a season,
+    from successful passes before the team's first substitution.
+
+    Parameters:
+    - competitionId: The ID of the competition.
+    - seasonId: The ID of the season.
+
+    Returns:
+    - network: A PassingNetwork keyed by (game_id, team_id).
+    """
+    games = getMetadataCache().games(competitionId, seasonId)
+    events = pd.concat(
+        [
+            loadEvents(
+                gameId,
+                columns=NETWORK_COLUMNS,
+                filters=[("type_name", "in", ["Pass", "Substitution"])],
+            )
+            for gameId in games["game_id"]
+        ],
+        ignore_index=True,
+    )
+    return PassingNetwork.fromPasses(passesBeforeFirstSubstitution(events))
+
+
+def passingNetworkData(match, teamId, playerMappings=None):
+    """
+    Computes the passing network of a team, from its successful passes
+    before its first substitution.
+
+    Parameters:
+    - match: The Match to read passes from.
+    - teamId: The ID of the team.
+    - playerMappings: Optional dict renaming players (e.g. shorter names).
+
+    Returns:
+    - playerStats: Passes made and average pass location, per player.
+    - pairPassCount: Passes exchanged, per pair of players ("a_b" keys) with
+      more than three passes.
+    """
+    frame = match.table.frame
+    passes = passesBeforeFirstSubstitution(
+        frame[frame["team_id"] == teamId].assign(game_id=match.gameId)
+    )
+    network = PassingNetwork.fromPasses(passes, groupBy=["team_id"])
+    nodes = network.groupNodes(teamId)
+    names = nodes["player_name"]
+    if playerMappings:
+        names = names.replace(playerMappings)
+
+    passers = nodes["num_passes"] > 0
+    playerStats = (
+        nodes[passers]
+        .set_index(names[passers].rename("player_name"))[["num_passes", "x", "y"]]
+        .sort_index()
+    )
+
+    edges = network.groupEdges(teamId, minPasses=4)
+    pairKeys = [
+        "_".join(sorted([names[a], names[b]]))
+        for a, b in zip(edges["node_a"], edges["node_b"])
+    ]
+    pairPassCount = (
+        edges[["num_passes"]].set_axis(pd.Index(pairKeys, name="pair_key")).sort_index()
+    )
+
+    return playerStats, pairPassCount
+
+
+def drawPassingNetwork(match, teamId, teamColor, filename, playerMappings=None):
+    """
+    Draws the passing network of a team and saves it to filename.
+    """
+    playerStats, pairPassCount = passingNetworkData(match, teamId, playerMappings)
+    maxPlayerPassCount = playerStats.num_passes.max()
+    maxPairPassCount = pairPassCount.num_passes.max()
+
+    pitch = FullPitch()
+    fig, ax = plt.subplots(1, 1, figsize=(15, 15 * PITCH_RATIO), dpi=300)
+    ax.set_facecolor(FIG_BACKGROUND_COLOR)
+    pitch.draw(ax)
+
+    pairs = pairPassCount.index.str.split("_", n=1, expand=True)
+    start = playerStats.loc[pairs.get_level_values(0)]
+    end = playerStats.loc[pairs.get_level_values(1)]
+    edgeLayer(
+        ax,
+        start["x"],
+        start["y"],
+        end["x"],
+        end["y"],
+        widths=3.5 * pairPassCount["num_passes"] / maxPairPassCount,
+        color=teamColor,
+        alpha=0.4,
+        zorder=3,
+    )
+
+    # Ring markers: a team colored dot with a background colored dot on top
+    markerSize = 100 * playerStats["num_passes"] / maxPlayerPassCount
+    for size, color, zorder in (
+        (markerSize, teamColor, 5),
+        (markerSize - 15, FIG_BACKGROUND_COLOR, 6),
+    ):
+        scatterLayer(
+            ax,
+            playerStats["x"],
+            playerStats["y"],
+            sizes=size**2,
+            colors=color,
+            markers=".",
+            zorders=zorder,
+            edgecolor="face",
+            linewidth=1.0,
+        )
+
+    for playerName, row in playerStats.iterrows():
+        ax.annotate(
+            playerName.split()[-1],
+            xy=(row["x"], row["y"]),
+            ha="center",
+            va="center",
+            zorder=7,
+            weight="bold",
+            size=8,
+            path_effects=[pe.withStroke(linewidth=2, foreground="white")],
+        )
+
+    legendElements = [
+        ax.scatter(
+            [],
+            [],
+            s=15,
+            edgecolor=teamColor,
+            linewidth=1,
+            facecolor=(1, 1, 1, 0.8),
+            zorder=5,
+            marker="o",
+            label="Few passes made",
+        ),
+        ax.scatter(
+            [],
+            [],
+            s=150,
+            edgecolor=teamColor,
+            linewidth=2,
+            facecolor=(1, 1, 1, 0.8),
+            zorder=5,
+            marker="o",
+            label="Many passes made",
+        ),
+        mlines.Line2D(
+            [],
+            [],
+            color=teamColor,
+            linewidth=1,
+            linestyle="solid",
+            label=f"Pair combines rarely",
+        ),
+        mlines.Line2D(
+            [],
+            [],
+            color=teamColor,
+            linewidth=4,
+            linestyle="solid",
+            label=f"Pair combines frequently",
+        ),
+    ]
+
+    extra_text = [
+        "Player positions are based on the average locations from which passes were made.",
+        "Only events occurring before the first substitution are included.",
+    ]
+
+    pitch.addPitchLegend(ax, legendElements)
+    pitch.addPitchNotes(
+        ax,
+        extra_text=extra_text,
+    )
+    fig.patch.set_facecolor(FIG_BACKGROUND_COLOR)
+
+    saveFigure(fig, filename)
+    plt.close(fig)
@@ -0,0 +1,36 @@
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.colors import to_rgba
+
+
+def drawMarkings(ax, segments, patches, lines_color):
+    """
+    Adds the pitch markings to ax as one LineCollection for the straight lines
+    and one PatchCollection for the arcs and spots.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+    segments : np.ndarray
+        (n_lines, 2, 2) array of line start and end points.
+    patches : list
+        (patch, alpha) pairs. Only the geometry of the patches is used, so the
+        same patches can be shared by every axes.
+    lines_color : str
+        Color of the markings.
+    """
+    ax.add_collection(
+        LineCollection(
+            segments, colors=to_rgba(lines_color, 0.8), linewidths=1.5, zorder=3
+        ),
+        autolim=False,
+    )
+    colors = [to_rgba(lines_color, alpha) for _, alpha in patches]
+    ax.add_collection(
+        PatchCollection(
+            [patch for patch, _ in patches],
+            facecolors=colors,
+            edgecolors=colors,
+            zorder=4,
+        ),
+        autolim=False,
+    )
@@ -0,0 +1,108 @@
+import numpy as np
+
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+
+
+def _perPoint(values, n, dtype=None):
+    return np.broadcast_to(np.asarray(values, dtype=dtype), (n,))
+
+
+def scatterLayer(
+    ax, x, y, sizes, colors, alphas=None, markers="o", zorders=1, **kwargs
+):
+    """
+    Draw a layer of markers with one PathCollection per (marker, zorder)
+    group instead of one artist per point.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+    x, y : array-like
+        Marker coordinates.
+    sizes : float or array-like
+        Marker areas in points^2, as in ax.scatter.
+    colors : color or sequence of colors
+        Face color of every marker (or one for all).
+    alphas : float or array-like, optional
+        Per-point alpha, overriding the alpha of colors.
+    markers : str or array-like, optional
+        Marker of every point (or one for all). Default is "o".
+    zorders : float or array-like, optional
+        Drawing order of every point (or one for all). Default is 1.
+    **kwargs
+        Passed to ax.scatter (e.g. edgecolor, linewidth). edgecolor="face"
+        strokes every marker with its face color.
+
+    Returns
+    -------
+    list of matplotlib.collections.PathCollection
+        One collection per (marker, zorder) group.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    sizes = _perPoint(sizes, n, dtype=float)
+    facecolors = to_rgba_array(colors)
+    if len(facecolors) == 1:
+        facecolors = np.repeat(facecolors, n, axis=0)
+    if alphas is not None:
+        facecolors[:, 3] = _perPoint(alphas, n, dtype=float)
+    markers = _perPoint(markers, n, dtype=object)
+    zorders = _perPoint(zorders, n, dtype=float)
+
+    collections = []
+    for marker, zorder in sorted(set(zip(markers, zorders)), key=lambda g: g[1]):
+        idx = np.flatnonzero((markers == marker) & (zorders == zorder))
+        collections.append(
+            ax.scatter(
+                x[idx],
+                y[idx],
+                s=sizes[idx],
+                c=facecolors[idx],
+                marker=marker,
+                zorder=zorder,
+                **kwargs,
+            )
+        )
+    return collections
+
+
+def edgeLayer(ax, x0, y0, x1, y1, widths, color, alpha=1.0, zorder=3, **kwargs):
+    """
+    Draw straight edges (e.g. passing network pairs) as a single LineCollection
+    with one line width per edge.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+    x0, y0, x1, y1 : array-like
+        Start and end coordinates of every edge.
+    widths : float or array-like
+        Line width of every edge (or one for all).
+    color : color or sequence of colors
+        Color of every edge (or one for all).
+    alpha : float, optional
+        Transparency of the edges. Default is 1.
+    zorder : float, optional
+        Drawing order. Default is 3.
+    **kwargs
+        Passed to LineCollection (e.g. linestyle).
+
+    Returns
+    -------
+    matplotlib.collections.LineCollection
+    """
+    segments = np.stack(
+        [np.column_stack([x0, y0]), np.column_stack([x1, y1])], axis=1
+    ).astype(float)
+    colors = to_rgba_array(color, alpha)
+    edges = LineCollection(
+        segments,
+        colors=colors,
+        linewidths=_perPoint(widths, len(segments), dtype=float),
+        zorder=zorder,
+        **kwargs,
+    )
+    ax.add_collection(edges, autolim=False)
+    return edges
@@ -0,0 +1,204 @@
+"""
+
+Multiprocess rendering of per-match figures.
+
+A render job names a match, a kind of figure and its parameters. Jobs are
+grouped by match so every worker process loads a match from the match store
+only once, and the groups are spread over a process pool whose workers draw
+with the non-interactive Agg backend. Jobs without a match (e.g. season shot
+maps, whose shots come in their parameters) each run on their own.
+
+"""
+
+import os
+import time
+import matplotlib
+import numpy as np
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from tqdm import tqdm
+from .commons import fetchMatch, getMetadataCache
+from .freezeFrame import (
+    AWAY_TEAM_COLOR,
+    HOME_TEAM_COLOR,
+    FreezeFrameRenderer,
+    renderShotFreezeFrames,
+)
+from .passingNetwork import drawPassingNetwork
+from .shotMap import (
+    ShotMapRenderer,
+    loadShots,
+    renderMatchShotMaps,
+    renderTeamShotMaps,
+)
+
+RenderJob = namedtuple("RenderJob", ["gameId", "kind", "params"])
+
+
+def _renderShotFreezeFrames(
+    match, folder, colors=(HOME_TEAM_COLOR, AWAY_TEAM_COLOR)
+):
+    os.makedirs(folder, exist_ok=True)
+    return renderShotFreezeFrames(
+        match, folder, renderer=_workerRenderer(), colors=colors
+    )
+
+
+def _renderPassingNetwork(match, folder, teamIndex, teamColor, playerMappings=None):
+    os.makedirs(folder, exist_ok=True)
+    teamName = match.teamNames[teamIndex]
+    path = f"{folder}/{match.gameId}_{teamName}.png"
+    drawPassingNetwork(
+        match,
+        match.teamIdentifiers[teamIndex],
+        teamColor,
+        path,
+        playerMappings=playerMappings,
+    )
+    return [path]
+
+
+def _renderShotMaps(match, shots, games, folder):
+    return renderMatchShotMaps(
+        shots, games, folder, renderer=_workerRenderer(ShotMapRenderer)
+    )
+
+
+def _renderTeamShotMaps(match, shots, folder):
+    return renderTeamShotMaps(shots, folder, renderer=_workerRenderer(ShotMapRenderer))
+
+
+# Job kind -> render(match, **params) returning the saved image paths, match
+# is None for jobs without a gameId
+RENDERERS = {
+    "shotFreezeFrames": _renderShotFreezeFrames,
+    "passingNetwork": _renderPassingNetwork,
+    "shotMaps": _renderShotMaps,
+    "teamShotMaps": _renderTeamShotMaps,
+}
+
+_renderers = {}
+
+
+def _workerRenderer(rendererClass=FreezeFrameRenderer):
+    # One figure of each kind per worker process, reused across jobs
+    if rendererClass not in _renderers:
+        _renderers[rendererClass] = rendererClass()
+    return _renderers[rendererClass]
+
+
+def initRenderWorker(fontFamily):
+    """Process pool initializer: Agg backend and the given font family."""
+    matplotlib.use("Agg")
+    matplotlib.rcParams["font.family"] = fontFamily
+
+
+def _renderMatch(gameId, jobs):
+    match = fetchMatch(gameId) if gameId is not None else None
+    paths = []
+    for job in jobs:
+        paths.extend(RENDERERS[job.kind](match, **job.params))
+    if match is not None:
+        match.release()
+    return paths
+
+
+def seasonShotMapJobs(competitionId, seasonId, folder, chunks=None):
+    """
+    Render jobs for the shot map of every match and of every team of a
+    season. The season's shots are read in a single query and split over
+    the jobs, which need no match loaded.
+
+    Parameters:
+    - competitionId: The ID of the competition.
+    - seasonId: The ID of the season.
+    - folder: Output folder of the match maps, team maps go to folder/teams.
+    - chunks: Number of match map jobs (default: four per CPU), team maps get
+      a quarter as many.
+
+    Returns:
+    - jobs: The RenderJob to pass to runRenderJobs.
+    """
+    games = getMetadataCache().games(competitionId, seasonId)
+    shots = loadShots(list(games["game_id"]))
+    chunks = chunks or os.cpu_count() * 4
+
+    jobs = []
+    for rows in np.array_split(range(len(games)), chunks):
+        if len(rows):
+            chunk = games.iloc[rows]
+            jobs.append(
+                RenderJob(
+                    None,
+                    "shotMaps",
+                    {
+                        "shots": shots[shots["game_id"].isin(chunk["game_id"])],
+                        "games": chunk,
+                        "folder": folder,
+                    },
+                )
+            )
+    teams = shots["team_name"].unique()
+    for chunk in np.array_split(teams, max(chunks // 4, 1)):
+        if len(chunk):
+            jobs.append(
+                RenderJob(
+                    None,
+                    "teamShotMaps",
+                    {
+                        "shots": shots[shots["team_name"].isin(chunk)],
+                        "folder": f"{folder}/teams",
+                    },
+                )
+            )
+    return jobs
+
+
+def runRenderJobs(jobs, workers=None, fontFamily="Monospace"):
+    """
+    Renders a list of RenderJob across a process pool.
+
+    Parameters:
+    - jobs: The RenderJob to run. kind is a key of RENDERERS and params are
+      passed to it as keyword arguments. Jobs with gameId None run without a
+      match.
+    - workers: Number of worker processes (default: one per CPU).
+    - fontFamily: matplotlib font family used by the workers.
+
+    Returns:
+    - paths: The paths of every saved image.
+    - failed: The gameId of every match whose jobs raised (None for jobs
+      without a match), with the error.
+    - elapsed: Wall-clock seconds the rendering took, for throughput.
+    """
+    for job in jobs:
+        if job.kind not in RENDERERS:
+            raise ValueError(f"Unknown render job kind: {job.kind}")
+
+    byMatch = {}
+    groups = []
+    for job in jobs:
+        if job.gameId is None:
+            groups.append((None, [job]))
+        else:
+            byMatch.setdefault(job.gameId, []).append(job)
+    groups = list(byMatch.items()) + groups
+
+    paths, failed = [], []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initRenderWorker, initargs=(fontFamily,)
+    ) as pool:
+        futures = {
+            pool.submit(_renderMatch, gameId, matchJobs): gameId
+            for gameId, matchJobs in groups
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), leave=False):
+            try:
+                paths.extend(future.result())
+            except Exception as e:
+                failed.append((futures[future], e))
+    elapsed = time.perf_counter() - start
+
+    return paths, failed, elapsed
@@ -0,0 +1,70 @@
+"""
+
+Vectorized shot scores, computed over whole arrays of shots at once.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+from .shotGeometry import goalMouthPlacement
+
+
+def roundLikePython(values, decimals):
+    """
+    Round an array like Python's round() rounds each float.
+
+    np.round scales by 10**decimals before rounding, so values within float
+    error of a tie (e.g. 0.0245) may round the other way than Python's
+    correctly rounded round(). Those few values are redone in Python.
+
+    Parameters
+    ----------
+    values : array-like
+        Values to round.
+    decimals : int
+        Number of decimals.
+
+    Returns
+    -------
+    np.ndarray
+        Rounded values, as floats.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, decimals)
+    half = 0.5 * 10.0**-decimals
+    nearTie = np.abs(np.abs(values - rounded) - half) < 1e-9
+    rounded[nearTie] = [round(float(v), decimals) for v in values[nearTie]]
+    return rounded
+
+
+def xBangerScore(xg, technique, end_y, end_z):
+    """
+    Score how spectacular goals are: 1 - xG (rounded to 3 decimals), plus 0.1
+    for any technique other than "Normal" and 0.1 for shots ending more than
+    5 units from the centre of the goal mouth (height counted twice).
+
+    Parameters
+    ----------
+    xg : array-like
+        StatsBomb xG of every shot.
+    technique : array-like
+        Shot technique name of every shot. Missing techniques count as not
+        "Normal".
+    end_y, end_z : array-like
+        Shot end location y and z.
+
+    Returns
+    -------
+    np.ndarray
+        xBanger of every shot, rounded to 2 decimals.
+    """
+    xg = roundLikePython(xg, 3)
+    technique = pd.Series(technique, dtype=object).fillna("").to_numpy()
+    isSpecialTechnique = technique != "Normal"
+    placementY, placementZ = goalMouthPlacement(end_y, end_z)
+    distance = np.hypot(placementY, placementZ * 2)
+    score = 1 - xg
+    score = score + np.where(isSpecialTechnique, 0.1, 0.0)
+    score = score + np.where(distance > 5, 0.1, 0.0)
+    return roundLikePython(score, 2)
@@ -0,0 +1,187 @@
+import hashlib
+import operator
+import os
+import pickle
+import tempfile
+
+from tqdm import tqdm
+
+from .commons import getMetadataCache, loadEvents
+from .store import STORE_VERSION
+
+AGGREGATE_CACHE_DIR = "aggregate_cache"
+
+
+class PartialStore:
+    """
+    Persistent per-game partial results of a season aggregate.
+
+    Partials live under ``aggregate_cache/<name>-<key>/game_id=<id>.pkl``,
+    where key hashes the match store version and the columns, filters and
+    params the partials were computed from. params must hold every setting
+    the compute function depends on (e.g. grid size), plus a version number
+    to bump whenever the compute function itself changes; a change of any of
+    them starts a new, empty store instead of mixing stale partials in.
+    """
+
+    def __init__(
+        self, name, columns=None, filters=None, params=None, root=AGGREGATE_CACHE_DIR
+    ):
+        key = hashlib.sha1(
+            repr((STORE_VERSION, columns, filters, params)).encode()
+        ).hexdigest()[:8]
+        self.root = os.path.join(root, f"{name}-{key}")
+
+    def _path(self, game_id):
+        return os.path.join(self.root, f"game_id={game_id}.pkl")
+
+    def has(self, game_id):
+        return os.path.exists(self._path(game_id))
+
+    def read(self, game_id):
+        with open(self._path(game_id), "rb") as f:
+            return pickle.load(f)
+
+    def write(self, game_id, partial):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(partial, f)
+        os.replace(tmp_path, self._path(game_id))
+
+
+def iterSeasonPartials(
+    competitionId,
+    seasonId,
+    compute,
+    columns=None,
+    filters=None,
+    cacheName=None,
+    cacheParams=None,
+):
+    """
+    Yield (game ID, partial result) for every game of a season, in season
+    listing order, computing one game at a time.
+
+    Parameters
+    ----------
+    competitionId : int
+        ID of the competition.
+    seasonId : int
+        ID of the season.
+    compute : callable
+        compute(game, events) -> partial result of one game, where game is
+        the game's row of the season listing (game_id, home_team_name, ...).
+    columns : list, optional
+        Event columns to read from the match store. Default reads every
+        column.
+    filters : list, optional
+        Row filters in pyarrow syntax.
+    cacheName : str, optional
+        If given, partials are kept in a PartialStore of that name and only
+        the games without a stored partial are loaded and computed.
+    cacheParams : optional
+        Settings the compute function depends on, plus a version of the
+        function, see PartialStore. Must have a stable repr.
+    """
+    store = (
+        PartialStore(cacheName, columns, filters, cacheParams) if cacheName else None
+    )
+    games = getMetadataCache().games(competitionId, seasonId)
+    for game in tqdm(games.itertuples(), total=len(games), leave=False):
+        if store is not None and store.has(game.game_id):
+            yield game.game_id, store.read(game.game_id)
+            continue
+
+        events = loadEvents(game.game_id, columns=columns, filters=filters)
+        partial = compute(game, events)
+        if store is not None:
+            store.write(game.game_id, partial)
+        yield game.game_id, partial
+
+
+def aggregateSeason(
+    competitionId,
+    seasonId,
+    compute,
+    columns=None,
+    filters=None,
+    cacheName=None,
+    cacheParams=None,
+):
+    """
+    Compute a partial result for every game of a season, see
+    iterSeasonPartials for the parameters.
+
+    Returns
+    -------
+    dict
+        Game ID -> partial result, in season listing order.
+    """
+    return dict(
+        iterSeasonPartials(
+            competitionId, seasonId, compute, columns, filters, cacheName, cacheParams
+        )
+    )
+
+
+def aggregateSeasonByTeam(
+    competitionId,
+    seasonId,
+    compute,
+    combine=operator.add,
+    columns=None,
+    filters=None,
+    cacheName=None,
+    cacheParams=None,
+):
+    """
+    Iterate every game of a season once and send each team's share of that
+    game's events to a per-team accumulator.
+
+    Parameters
+    ----------
+    competitionId : int
+        ID of the competition.
+    seasonId : int
+        ID of the season.
+    compute : callable
+        compute(teamEvents) -> partial result of one team in one game.
+    combine : callable, optional
+        combine(accumulated, partial) -> merged result. Default adds the
+        partial results together (e.g. counters or np.ndarray grids).
+    columns : list, optional
+        Event columns to read from the match store. "team_name" is always
+        read. Default reads every column.
+    filters : list, optional
+        Row filters in pyarrow syntax, applied before splitting by team.
+    cacheName : str, optional
+        If given, the per-team partials of every game are persisted (see
+        aggregateSeason), so a refresh only computes newly played games.
+    cacheParams : optional
+        Settings compute depends on, plus its version, see PartialStore.
+
+    Returns
+    -------
+    dict
+        Team name -> combined result, for every team that played in the season.
+    """
+    if columns is not None and "team_name" not in columns:
+        columns = list(columns) + ["team_name"]
+
+    def computeGame(game, events):
+        return {
+            team: compute(events[events["team_name"] == team])
+            for team in (game.home_team_name, game.away_team_name)
+        }
+
+    results = {}
+    for _, gamePartials in iterSeasonPartials(
+        competitionId, seasonId, computeGame, columns, filters, cacheName, cacheParams
+    ):
+        for team, partial in gamePartials.items():
+            results[team] = (
+                combine(results[team], partial) if team in results else partial
+            )
+
+    return results
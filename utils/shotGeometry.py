@@ -0,0 +1,113 @@
+"""
+
+Vectorized shot geometry on the StatsBomb pitch (120x80, attacking the goal
+at x = 120), computed for whole arrays of shots in one NumPy pass.
+
+"""
+
+import numpy as np
+
+GOAL_X = 120
+GOAL_CENTER_Y = 40
+GOAL_WIDTH = 8
+CROSSBAR_Z = 2.67
+
+# Event table columns filled by addShotGeometry, see shotGeometry
+SHOT_GEOMETRY_COLUMNS = [
+    "shot_distance",
+    "shot_angle",
+    "shot_placement_y",
+    "shot_placement_z",
+    "shot_on_frame",
+]
+
+
+def goalMouthPlacement(end_y, end_z):
+    """
+    Where shots cross the goal line, relative to the centre of the goal mouth:
+    (horizontal offset, height). Missing heights (shots not reaching the goal
+    line) stay NaN.
+    """
+    return (
+        np.asarray(end_y, dtype=float) - GOAL_CENTER_Y,
+        np.asarray(end_z, dtype=float),
+    )
+
+
+def shotGeometry(x, y, end_y, end_z):
+    """
+    Compute the geometry of shots.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Shot locations.
+    end_y, end_z : array-like
+        Shot end locations y and z.
+
+    Returns
+    -------
+    dict of np.ndarray
+        shot_distance: distance from the shot to the centre of the goal.
+        shot_angle: angle (degrees) between the posts seen from the shot.
+        shot_placement_y, shot_placement_z: see goalMouthPlacement.
+        shot_on_frame: whether the shot ends between the posts and under the
+        crossbar.
+    """
+    dx = GOAL_X - np.asarray(x, dtype=float)
+    dy = np.asarray(y, dtype=float) - GOAL_CENTER_Y
+    placementY, placementZ = goalMouthPlacement(end_y, end_z)
+    return {
+        "shot_distance": np.hypot(dx, dy),
+        "shot_angle": np.degrees(
+            np.arctan2(GOAL_WIDTH * dx, dx**2 + dy**2 - (GOAL_WIDTH / 2) ** 2)
+        ),
+        "shot_placement_y": placementY,
+        "shot_placement_z": placementZ,
+        "shot_on_frame": (np.abs(placementY) <= GOAL_WIDTH / 2)
+        & (placementZ <= CROSSBAR_Z),
+    }
+
+
+def mirrorCoordinates(x, y, isHome):
+    """
+    Plot coordinates of events on a FullPitch with the home team attacking
+    the left goal and the away team the right one (180 degree rotation of the
+    home team's events, vertical flip of the away team's).
+
+    Parameters
+    ----------
+    x, y : array-like
+        Locations in raw StatsBomb orientation.
+    isHome : bool or array-like
+        Whether every event is the home team's.
+
+    Returns
+    -------
+    plot_x, plot_y : np.ndarray
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    return np.where(isHome, GOAL_X - x, x), np.where(isHome, y, 80 - y)
+
+
+def addShotGeometry(frame):
+    """
+    Adds the SHOT_GEOMETRY_COLUMNS to an event table frame: the geometry of
+    its shots, NaN (False for shot_on_frame) for other events.
+    """
+    isShot = (frame["type_name"] == "Shot").to_numpy()
+    geometry = shotGeometry(
+        frame["location_x"].to_numpy(dtype=float)[isShot],
+        frame["location_y"].to_numpy(dtype=float)[isShot],
+        frame["shot_end_y"].to_numpy(dtype=float)[isShot],
+        frame["shot_end_z"].to_numpy(dtype=float)[isShot],
+    )
+    for col in SHOT_GEOMETRY_COLUMNS:
+        values = geometry[col]
+        column = np.zeros(len(frame), dtype=values.dtype)
+        if values.dtype != bool:
+            column[:] = np.nan
+        column[isShot] = values
+        frame[col] = column
+    return frame
@@ -0,0 +1,220 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from matplotlib.colors import to_rgba_array
+
+from .commons import loadEventsMany, saveFigure
+from .config import FIG_BACKGROUND_COLOR
+from .fullPitch import FullPitch
+from .shotGeometry import mirrorCoordinates
+
+HOME_TEAM_COLOR = "#3f8ae6"
+AWAY_TEAM_COLOR = "#f04a5f"
+MARKER_SIZE = 120
+LINE_WIDTH = 0.7
+# Shot outcome -> (marker, size, zorder), "X" for every other outcome
+OUTCOME_STYLE = {
+    "Goal": ("*", MARKER_SIZE * 1.5, 7),
+    "Saved": ("o", MARKER_SIZE, 6),
+}
+OTHER_STYLE = ("X", MARKER_SIZE, 5)
+
+# Event columns read for shot maps
+SHOT_MAP_COLUMNS = [
+    "game_id",
+    "team_id",
+    "team_name",
+    "location_x",
+    "location_y",
+    "shot_xg",
+    "shot_outcome",
+]
+
+
+def loadShots(gameIds):
+    """
+    Reads the shots (penalty shootouts excluded) of many games in a single
+    columnar query, with the SHOT_MAP_COLUMNS.
+    """
+    return loadEventsMany(
+        gameIds,
+        columns=SHOT_MAP_COLUMNS,
+        filters=[("type_name", "==", "Shot"), ("period_id", "<", 5)],
+    )
+
+
+class ShotMapRenderer:
+    """
+    Reusable figure for shot maps.
+
+    The figure, pitch, legend and one scatter collection per outcome marker
+    are created once; each call to render() only replaces the offsets, sizes
+    and colors of the collections and rewrites the note, so rendering many
+    shot maps costs one redraw per map instead of a full matplotlib setup.
+    """
+
+    def __init__(self, figsize=(15, 15 * (80 / 120)), dpi=300):
+        self.pitch = FullPitch()
+        self.fig, self.ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
+        self.fig.patch.set_facecolor(FIG_BACKGROUND_COLOR)
+        self.ax.set_facecolor(FIG_BACKGROUND_COLOR)
+        self.pitch.draw(self.ax)
+
+        # One collection per marker, so a map is one scatter per outcome
+        self.layers = {
+            marker: self.ax.scatter(
+                [],
+                [],
+                marker=marker,
+                zorder=zorder,
+                edgecolor="black",
+                linewidth=LINE_WIDTH,
+            )
+            for marker, _, zorder in [OTHER_STYLE] + list(OUTCOME_STYLE.values())
+        }
+
+        legend_elements = [
+            self.ax.scatter(
+                [],
+                [],
+                s=90,
+                marker=marker,
+                label=label,
+                edgecolor="black",
+                linewidth=0.6,
+                facecolor=HOME_TEAM_COLOR,
+                zorder=5,
+            )
+            for marker, label in (
+                ("X", "Off Target"),
+                ("o", "On Target"),
+                ("*", "Goal"),
+            )
+        ]
+        self.legend_handles = self.pitch.addPitchLegend(
+            self.ax, legend_elements
+        ).legend_handles
+        (self.note,) = self.pitch.addPitchNotes(self.ax, extra_text=[""])
+
+    def render(
+        self, shots, isHome, colors=(HOME_TEAM_COLOR, AWAY_TEAM_COLOR), note=""
+    ):
+        """
+        Updates the figure to show a set of shots.
+
+        Parameters
+        ----------
+        shots : pd.DataFrame
+            Shots with location_x, location_y, shot_xg and shot_outcome.
+        isHome : bool or np.ndarray
+            Whether every shot is drawn as the home team's (attacking the left
+            goal, in the home color) or the away team's.
+        colors : tuple
+            (home color, away color).
+        note : str
+            Text shown below the pitch.
+        """
+        x, y = mirrorCoordinates(shots["location_x"], shots["location_y"], isHome)
+        isHome = np.broadcast_to(isHome, (len(shots),))
+        homeColor, awayColor = to_rgba_array(colors)
+        facecolors = np.where(isHome[:, None], homeColor, awayColor)
+        facecolors[:, 3] = np.clip(shots["shot_xg"].round(3) / 0.25, 0.1, 1.0)
+
+        markers = np.array(
+            [OUTCOME_STYLE.get(o, OTHER_STYLE)[0] for o in shots["shot_outcome"]]
+        )
+        for marker, size, _ in [OTHER_STYLE] + list(OUTCOME_STYLE.values()):
+            rows = markers == marker
+            layer = self.layers[marker]
+            layer.set_offsets(np.column_stack([x[rows], y[rows]]))
+            layer.set_sizes(np.full(rows.sum(), size))
+            layer.set_facecolor(facecolors[rows])
+
+        for handle in self.legend_handles:
+            handle.set_facecolor(colors[0])
+        self.note.set_text(note)
+
+    def close(self):
+        plt.close(self.fig)
+
+
+def renderMatchShotMaps(
+    shots, games, folder, renderer=None, colors=(HOME_TEAM_COLOR, AWAY_TEAM_COLOR)
+):
+    """
+    Saves one shot map per match to folder.
+
+    Parameters:
+    - shots: Shots of any number of games, e.g. from loadShots.
+    - games: Season listing rows of the games (game_id, home_team_id,
+      home_team_name, away_team_name), as returned by MetadataCache.games.
+    - folder: Output folder, images are named shotmap_<game_id>.png.
+    - renderer: ShotMapRenderer to reuse (default: a new one, closed when
+      done).
+    - colors: (home team color, away team color).
+
+    Returns:
+    - paths: The paths of the saved images.
+    """
+    own_renderer = renderer is None
+    if own_renderer:
+        renderer = ShotMapRenderer()
+
+    os.makedirs(folder, exist_ok=True)
+    shotsByGame = dict(tuple(shots.groupby("game_id", sort=False)))
+    paths = []
+    for game in games.itertuples():
+        gameShots = shotsByGame.get(game.game_id, shots.iloc[:0])
+        renderer.render(
+            gameShots,
+            (gameShots["team_id"] == game.home_team_id).to_numpy(),
+            colors=colors,
+            note=f"{game.home_team_name} vs {game.away_team_name}",
+        )
+        path = f"{folder}/shotmap_{game.game_id}.png"
+        saveFigure(renderer.fig, path)
+        paths.append(path)
+
+    if own_renderer:
+        renderer.close()
+    return paths
+
+
+def renderTeamShotMaps(shots, folder, renderer=None, color=HOME_TEAM_COLOR):
+    """
+    Saves one shot map per team, with every shot of the team attacking the
+    same goal, to folder.
+
+    Parameters:
+    - shots: Shots of any number of games, e.g. from loadShots.
+    - folder: Output folder, images are named shotmap_<team name>.png.
+    - renderer: ShotMapRenderer to reuse (default: a new one, closed when
+      done).
+    - color: Color of the shots.
+
+    Returns:
+    - paths: The paths of the saved images.
+    """
+    own_renderer = renderer is None
+    if own_renderer:
+        renderer = ShotMapRenderer()
+
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for teamName, teamShots in shots.groupby("team_name"):
+        renderer.render(
+            teamShots,
+            True,
+            colors=(color, color),
+            note=f"{teamName}, {teamShots['game_id'].nunique()} matches",
+        )
+        path = f"{folder}/shotmap_{teamName}.png"
+        saveFigure(renderer.fig, path)
+        paths.append(path)
+
+    if own_renderer:
+        renderer.close()
+    return paths
+
@@ -0,0 +1,290 @@
+"""
+
+Batched spatial queries over freeze-frame player positions.
+
+The players of many frames (shot freeze frames or 360 frames, of one match
+or a whole season) are packed into flat arrays, and each query is answered
+for every frame at once. A frame holds at most 22 players, so queries
+compare every player of a frame with its query point directly: with so few
+points per frame a KD-tree or grid would cost more to build than it saves,
+and brute force over the packed arrays runs as a handful of NumPy calls no
+matter how many frames there are.
+
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .commons import getMetadataCache, loadEvents
+
+# Goal posts of the attacked goal on the StatsBomb pitch
+LEFT_POST = (120, 36)
+RIGHT_POST = (120, 44)
+
+
+class PlayerFrames:
+    """
+    Packed player positions of many frames.
+
+    The players of the i-th frame are rows offsets[i]:offsets[i + 1] of xy /
+    teammate / keeper / actor, and origin[i] is the location of the frame's
+    event (e.g. the shooter), NaN when unknown. teammate is relative to the
+    player performing the event. Coordinates are in raw StatsBomb
+    orientation.
+    """
+
+    def __init__(self, event_ids, offsets, xy, teammate, keeper, actor, origin):
+        self.event_ids = event_ids
+        self.offsets = offsets
+        self.xy = xy
+        self.teammate = teammate
+        self.keeper = keeper
+        self.actor = actor
+        self.origin = origin
+        # Frame of every player row
+        self.frame = np.repeat(np.arange(len(event_ids)), np.diff(offsets))
+
+    @classmethod
+    def fromShots(cls, shots):
+        """
+        Packs the freeze frames of shots.
+
+        Parameters:
+        - shots: Shot events with event_id, location_x, location_y and either
+          extra (dict) or extra_json. Shots without a freeze frame get an
+          empty frame.
+        """
+        if "extra" in shots:
+            extras = shots["extra"].tolist()
+        else:
+            extras = [json.loads(e) for e in shots["extra_json"]]
+        frames = [
+            (e if isinstance(e, dict) else {}).get("shot", {}).get("freeze_frame") or []
+            for e in extras
+        ]
+        players = [p for f in frames for p in f]
+        return cls(
+            event_ids=shots["event_id"].to_numpy(dtype=str),
+            offsets=np.cumsum([0] + [len(f) for f in frames]),
+            xy=np.array([p["location"][:2] for p in players], dtype=float).reshape(
+                -1, 2
+            ),
+            teammate=np.array([p["teammate"] for p in players], dtype=bool),
+            keeper=np.array(
+                [p.get("position", {}).get("name") == "Goalkeeper" for p in players],
+                dtype=bool,
+            ),
+            actor=np.zeros(len(players), dtype=bool),
+            origin=shots[["location_x", "location_y"]].to_numpy(dtype=float),
+        )
+
+    @classmethod
+    def fromFrames360(cls, frames360, events=None):
+        """
+        Wraps the 360 frames of a match, without copying them.
+
+        Parameters:
+        - frames360: The Frames360 of the match.
+        - events: Optional events with event_id, location_x and location_y,
+          used as frame origins. Default is the actor's position in the
+          frame, NaN for frames without a visible actor.
+        """
+        offsets = frames360.player_offsets
+        origin = np.full((len(frames360), 2), np.nan)
+        if events is not None:
+            locations = events.set_index("event_id")[["location_x", "location_y"]]
+            origin = locations.reindex(frames360.event_ids).to_numpy(dtype=float)
+        else:
+            rows = np.flatnonzero(frames360.actor)
+            frame = np.searchsorted(offsets, rows, side="right") - 1
+            origin[frame] = frames360.player_xy[rows]
+        return cls(
+            event_ids=frames360.event_ids,
+            offsets=offsets,
+            xy=frames360.player_xy,
+            teammate=frames360.teammate,
+            keeper=frames360.keeper,
+            actor=frames360.actor,
+            origin=origin,
+        )
+
+    @classmethod
+    def concat(cls, frames):
+        """Packs the frames of many PlayerFrames (e.g. every match of a season)."""
+        sizes = [len(f.xy) for f in frames]
+        shifts = np.cumsum([0] + sizes[:-1])
+        return cls(
+            event_ids=np.concatenate([f.event_ids for f in frames]),
+            offsets=np.concatenate(
+                [[0]] + [f.offsets[1:] + s for f, s in zip(frames, shifts)]
+            ),
+            xy=np.concatenate([f.xy for f in frames]).reshape(-1, 2),
+            teammate=np.concatenate([f.teammate for f in frames]),
+            keeper=np.concatenate([f.keeper for f in frames]),
+            actor=np.concatenate([f.actor for f in frames]),
+            origin=np.concatenate([f.origin for f in frames]).reshape(-1, 2),
+        )
+
+    def __len__(self):
+        return len(self.event_ids)
+
+    def _points(self, points):
+        """Query point of every frame: the origins, one point, or one per frame."""
+        if points is None:
+            return self.origin
+        return np.broadcast_to(np.asarray(points, dtype=float), (len(self), 2))
+
+    def _select(self, teammate, keeper):
+        """Mask of the player rows a query looks at (the actor never counts)."""
+        mask = ~self.actor
+        if teammate is not None:
+            mask &= self.teammate == teammate
+        if keeper is not None:
+            mask &= self.keeper == keeper
+        return mask
+
+    def _count(self, hits):
+        return np.bincount(self.frame[hits], minlength=len(self))
+
+    def nearest(self, k=1, points=None, teammate=None, keeper=None):
+        """
+        The k players of every frame closest to its query point.
+
+        Parameters:
+        - k: Number of neighbours.
+        - points: Query point, (2,) for all frames or (n_frames, 2). Default
+          is the frame origins.
+        - teammate: True / False to only look at teammates / opponents.
+        - keeper: True / False to only look at keepers / outfield players.
+
+        Returns:
+        - distances: (n_frames, k) distances, ascending, inf where a frame has
+          fewer than k selected players.
+        - rows: (n_frames, k) rows into xy of the neighbours, -1 where missing.
+        """
+        points = self._points(points)
+        counts = np.diff(self.offsets)
+        width = max(int(counts.max()) if len(counts) else 0, k)
+        column = np.arange(len(self.xy)) - self.offsets[self.frame]
+
+        distances = np.full((len(self), width), np.inf)
+        rows = np.full((len(self), width), -1)
+        selected = self._select(teammate, keeper)
+        frame, column = self.frame[selected], column[selected]
+        distances[frame, column] = np.hypot(*(self.xy[selected] - points[frame]).T)
+        rows[frame, column] = np.flatnonzero(selected)
+        distances[np.isnan(distances)] = np.inf
+
+        order = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        distances = np.take_along_axis(distances, order, axis=1)
+        rows = np.take_along_axis(rows, order, axis=1)
+        rows[np.isinf(distances)] = -1
+        return distances, rows
+
+    def countWithinRadius(self, radius, points=None, teammate=None, keeper=None):
+        """
+        Number of players of every frame within radius of its query point,
+        see nearest for the parameters.
+        """
+        points = self._points(points)
+        selected = self._select(teammate, keeper)
+        distances = np.hypot(*(self.xy - points[self.frame]).T)
+        return self._count(selected & (distances <= radius))
+
+    def countInTriangle(self, a, b, c, teammate=None, keeper=None):
+        """
+        Number of players of every frame inside (or on the edge of) the
+        triangle a, b, c. Each vertex is (2,) for all frames or
+        (n_frames, 2), e.g. the origins and the goal posts. Frames with a NaN
+        vertex count no players.
+        """
+        a, b, c = (self._points(v)[self.frame] for v in (a, b, c))
+
+        def side(p, q):
+            return (q[:, 0] - p[:, 0]) * (self.xy[:, 1] - p[:, 1]) - (
+                q[:, 1] - p[:, 1]
+            ) * (self.xy[:, 0] - p[:, 0])
+
+        s1, s2, s3 = side(a, b), side(b, c), side(c, a)
+        hasNegative = (s1 < 0) | (s2 < 0) | (s3 < 0)
+        hasPositive = (s1 > 0) | (s2 > 0) | (s3 > 0)
+        # A NaN vertex (e.g. a frame without origin) contains no players
+        unknown = np.isnan(s1) | np.isnan(s2) | np.isnan(s3)
+        inside = ~(hasNegative & hasPositive) & ~unknown
+        return self._count(self._select(teammate, keeper) & inside)
+
+    def countBetweenGoal(self, teammate=False, keeper=None):
+        """
+        Number of players (by default opponents, keeper included) inside the
+        triangle between every frame's origin and the posts of the goal it
+        attacks.
+        """
+        return self.countInTriangle(
+            self.origin, LEFT_POST, RIGHT_POST, teammate=teammate, keeper=keeper
+        )
+
+    def countInCone(
+        self,
+        target,
+        halfAngle,
+        maxDistance=np.inf,
+        points=None,
+        teammate=None,
+        keeper=None,
+    ):
+        """
+        Number of players of every frame in the cone from its query point
+        towards target.
+
+        Parameters:
+        - target: Point the cone is aimed at, (2,) or (n_frames, 2), e.g. the
+          goal centre or a pass end location.
+        - halfAngle: Half aperture of the cone, in degrees.
+        - maxDistance: Length of the cone. Default is unbounded.
+        - points, teammate, keeper: See nearest.
+        """
+        points = self._points(points)[self.frame]
+        target = self._points(target)[self.frame]
+        toPlayer = self.xy - points
+        toTarget = target - points
+        distance = np.hypot(*toPlayer.T)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cosine = np.einsum("ij,ij->i", toPlayer, toTarget) / (
+                distance * np.hypot(*toTarget.T)
+            )
+        inCone = (cosine >= np.cos(np.radians(halfAngle))) & (distance <= maxDistance)
+        return self._count(self._select(teammate, keeper) & inCone)
+
+
+def seasonShotFrames(competitionId, seasonId):
+    """
+    Packs the shot freeze frames (penalty shootouts excluded) of every game
+    of a season, read from the match store.
+
+    Returns:
+    - frames: A PlayerFrames with one frame per shot.
+    - shots: The matching shots (game_id, event_id, team_id, location).
+    """
+    games = getMetadataCache().games(competitionId, seasonId)
+    shots = pd.concat(
+        [
+            loadEvents(
+                gameId,
+                columns=[
+                    "game_id",
+                    "event_id",
+                    "team_id",
+                    "location_x",
+                    "location_y",
+                    "extra_json",
+                ],
+                filters=[("type_name", "==", "Shot"), ("period_id", "<", 5)],
+            )
+            for gameId in games["game_id"]
+        ],
+        ignore_index=True,
+    )
+    frames = PlayerFrames.fromShots(shots)
+    return frames, shots.drop(columns="extra_json")
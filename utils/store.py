@@ -0,0 +1,241 @@
+"""
+
+Columnar on-disk store for fetched matches.
+
+Every game is written as a small set of Parquet files under
+``match_store/v<STORE_VERSION>/game_id=<id>/``, plus its packed 360 frames
+(see models.Frames360) when they were fetched. A manifest records whether the
+360 frames were loaded, unavailable or never requested. The fields that analysis
+scripts keep digging out of the nested ``extra`` dict are stored as the typed
+columns of the match's EventTable (e.g. pass_end_x, pass_success, shot_xg),
+together with the shot geometry of utils.shotGeometry (e.g. shot_distance),
+so a script can read only the columns and rows it needs instead of
+deserializing the whole events frame.
+
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from models import EventTable, Frames360, Match
+
+from .shotGeometry import addShotGeometry
+
+STORE_DIR = "match_store"
+STORE_VERSION = 4
+
+EVENT_COLS = [
+    "game_id",
+    "event_id",
+    "period_id",
+    "team_id",
+    "player_id",
+    "type_id",
+    "type_name",
+    "index",
+    "timestamp",
+    "minute",
+    "second",
+    "possession",
+    "possession_team_id",
+    "possession_team_name",
+    "play_pattern_id",
+    "play_pattern_name",
+    "team_name",
+    "duration",
+    "extra",
+    "related_events",
+    "player_name",
+    "position_id",
+    "position_name",
+    "location",
+    "under_pressure",
+    "counterpress",
+]
+
+# Status of the 360 frames of a stored game
+FRAMES_LOADED = "loaded"
+FRAMES_UNAVAILABLE = "unavailable"
+FRAMES_NOT_REQUESTED = "not_requested"
+
+
+class MatchStore:
+    def __init__(self, root=STORE_DIR):
+        if pyarrow is None:
+            raise ImportError(
+                """The 'pyarrow' package is required. Install with 'pip install pyarrow'."""
+            )
+        self.root = os.path.join(root, f"v{STORE_VERSION}")
+
+    def _game_dir(self, game_id):
+        return os.path.join(self.root, f"game_id={game_id}")
+
+    def has(self, game_id, load_360=False):
+        """
+        Whether the game is stored. With load_360, the game only counts as
+        stored if its 360 frames were requested when it was fetched.
+        """
+        if not os.path.isdir(self._game_dir(game_id)):
+            return False
+        return not load_360 or self.frames_status(game_id) != FRAMES_NOT_REQUESTED
+
+    def frames_status(self, game_id):
+        with open(os.path.join(self._game_dir(game_id), "manifest.json")) as f:
+            return json.load(f)["frames_360"]
+
+    def write(self, game_id, events, teams, players, frames=None, load_360=False):
+        """
+        Writes a game to the store. frames is the raw 360 payload, or None if
+        it was not requested (load_360 False) or not available. Files are first
+        written to a temporary directory and then moved in place, so concurrent
+        writers and readers never see a partially written game.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=self.root, prefix=".tmp-")
+        try:
+            self._flatten_events(events).to_parquet(
+                os.path.join(tmp_dir, "events.parquet"), index=False
+            )
+            teams.to_parquet(os.path.join(tmp_dir, "teams.parquet"), index=False)
+            players.to_parquet(os.path.join(tmp_dir, "players.parquet"), index=False)
+            self._write_frames_360(tmp_dir, frames, load_360)
+            os.replace(tmp_dir, self._game_dir(game_id))
+        except OSError:
+            # Another writer stored the same game first
+            if not self.has(game_id):
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def write_frames_360(self, game_id, frames):
+        """
+        Adds the 360 frames (raw payload, or None if not available) to a game
+        that was stored without them.
+        """
+        self._write_frames_360(self._game_dir(game_id), frames, load_360=True)
+
+    def _write_frames_360(self, game_dir, frames, load_360):
+        if frames is not None:
+            status = FRAMES_LOADED
+            fd, tmp_path = tempfile.mkstemp(dir=game_dir, suffix=".tmp")
+            os.close(fd)
+            Frames360.fromFrames(frames).save(tmp_path)
+            os.replace(tmp_path, os.path.join(game_dir, "frames360.npz"))
+        else:
+            status = FRAMES_UNAVAILABLE if load_360 else FRAMES_NOT_REQUESTED
+
+        fd, tmp_path = tempfile.mkstemp(dir=game_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"frames_360": status}, f)
+        os.replace(tmp_path, os.path.join(game_dir, "manifest.json"))
+
+    def read_events(self, game_id, columns=None, filters=None):
+        """
+        Reads the events of a game, optionally projecting columns and
+        filtering rows (pyarrow filter syntax, e.g. [("type_name", "==", "Pass")]).
+        """
+        return pd.read_parquet(
+            os.path.join(self._game_dir(game_id), "events.parquet"),
+            columns=columns,
+            filters=filters,
+        )
+
+    def read_events_many(self, game_ids, columns=None, filters=None):
+        """
+        Reads the events of many games in a single columnar scan, with the
+        same column projection and row filters as read_events. Rows keep the
+        order of game_ids, then event order.
+        """
+        paths = [
+            os.path.join(self._game_dir(game_id), "events.parquet")
+            for game_id in game_ids
+        ]
+        if not paths:
+            return pd.DataFrame(columns=columns)
+        # Columns that are all null in a game are typed null there, so the
+        # scan uses the schema unified over every game
+        schema = pyarrow.unify_schemas(
+            [pyarrow.parquet.read_schema(path) for path in paths]
+        )
+        dataset = pyarrow.dataset.dataset(paths, schema=schema, format="parquet")
+        table = dataset.to_table(
+            columns=columns,
+            filter=(
+                pyarrow.parquet.filters_to_expression(filters) if filters else None
+            ),
+        )
+        return table.to_pandas()
+
+    def read_teams(self, game_id):
+        return pd.read_parquet(os.path.join(self._game_dir(game_id), "teams.parquet"))
+
+    def read_players(self, game_id):
+        return pd.read_parquet(
+            os.path.join(self._game_dir(game_id), "players.parquet")
+        )
+
+    def read_match(self, game_id):
+        """
+        Returns a lazy Match that reads its frames from the store on access.
+        """
+        return Match(game_id, self.read_teams(game_id), self)
+
+    def read_table(self, game_id, columns=None, filters=None):
+        """
+        Reads the typed EventTable columns of a game, optionally projecting
+        columns and filtering rows.
+        """
+        if columns is None:
+            columns = [
+                col
+                for col in self._event_columns(game_id)
+                if col not in ("related_events", "extra_json")
+            ]
+        return self.read_events(game_id, columns=columns, filters=filters)
+
+    def read_full_events(self, game_id):
+        """
+        Reads the events of a game in the same shape returned by Loader.events,
+        without the 360 columns.
+        """
+        flat = self.read_events(game_id)
+        flat["location"] = [
+            [x, y] if not np.isnan(x) else np.nan
+            for x, y in zip(flat["location_x"], flat["location_y"])
+        ]
+        flat["extra"] = flat["extra_json"].map(json.loads)
+        flat["related_events"] = flat["related_events"].map(list)
+
+        return flat[EVENT_COLS]
+
+    def read_frames_360(self, game_id):
+        """
+        Reads the packed 360 frames of a game, or None if they were not stored.
+        """
+        if self.frames_status(game_id) != FRAMES_LOADED:
+            return None
+        return Frames360.load(os.path.join(self._game_dir(game_id), "frames360.npz"))
+
+    def _event_columns(self, game_id):
+        return pyarrow.parquet.read_schema(
+            os.path.join(self._game_dir(game_id), "events.parquet")
+        ).names
+
+    def _flatten_events(self, events):
+        flat = addShotGeometry(EventTable.fromEvents(events).frame)
+        flat["related_events"] = events["related_events"]
+        flat["extra_json"] = events["extra"].map(json.dumps)
+
+        return flat